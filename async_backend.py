@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import requests
+
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import fetch
+
+class AsyncBackend:
+    # Runs every HTTP request of the process on one asyncio event loop in a
+    # background thread, using httpx. Getters keep running in the scheduler's
+    # worker threads, which now only parse; their fetches are handed to the
+    # loop, so hundreds of requests can be in flight at once.
+    def __init__(self, max_connections: int = 256):
+        try:
+            import httpx
+        except ImportError:
+            raise SystemExit("--backend async requires httpx (pip install httpx)")
+        self.httpx = httpx
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.client = self.run(self.create_client(limits))
+
+    async def create_client(self, limits):
+        return self.httpx.AsyncClient(limits=limits, follow_redirects=True, timeout=self.httpx.Timeout(fetch.timeout[1], connect=fetch.timeout[0]))
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(fetch.host_limit)
+        return self.semaphores[host]
+
+    def to_response(self, url: str, res) -> requests.Response:
+        converted = requests.Response()
+        converted.status_code = res.status_code
+        converted.reason = res.reason_phrase
+        converted._content = res.content
+        converted.headers = requests.structures.CaseInsensitiveDict(res.headers)
+        converted.encoding = requests.utils.get_encoding_from_headers(converted.headers)
+        converted.url = url
+        converted.elapsed = res.elapsed
+        return converted
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        # Same retry policy as fetch.download.
+        for attempt in range(fetch.retries):
+            bucket = fetch.host_bucket(url)
+            if bucket is not None:
+                wait = bucket.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                async with self.host_semaphore(url):
+                    res = await self.client.get(url, headers=headers)
+            except (self.httpx.TransportError, self.httpx.TimeoutException):
+                if attempt == fetch.retries - 1:
+                    raise
+                await asyncio.sleep(fetch.backoff_delay(attempt))
+                continue
+            res = self.to_response(url, res)
+            if res.status_code not in fetch.RETRY_STATUS or attempt == fetch.retries - 1:
+                break
+            delay = fetch.retry_after(res)
+            await asyncio.sleep(fetch.backoff_delay(attempt) if delay is None else delay)
+        res.raise_for_status()
+        return res
+
+    async def fetch_many(self, urls: List[str]) -> List[requests.Response]:
+        return await asyncio.gather(*[self.fetch(url) for url in urls])
+
+    def download(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        return self.run(self.fetch(url, headers))
+
+    def download_many(self, urls: List[str]) -> List[requests.Response]:
+        return self.run(self.fetch_many(urls))
+
+    def close(self) -> None:
+        # Closes the client's connections, then stops and closes the loop.
+        if self.loop.is_closed():
+            return
+        self.run(self.client.aclose())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
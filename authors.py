@@ -0,0 +1,144 @@
+import functools
+import json
+import re
+import sqlite3
+import unicodedata
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Author index over the corpus: every author of every stored paper, under a
+# normalized key, so the same person listed by different venues (affiliations
+# in parentheses on CVPR 2024, `*` marks in the ECCV CSV, accents, spacing)
+# is found as one. The paper_authors table is kept in sync with `papers` by
+# triggers, like the title index.
+
+@functools.lru_cache(maxsize=1 << 16)
+def clean_name(name: str) -> str:
+    # The displayed form: no affiliation, equal-contribution marks or extra
+    # whitespace.
+    name = re.sub(r"\([^)]*\)", " ", name)
+    name = re.sub(r"[*†‡§¶]+", " ", name)
+    return " ".join(name.split())
+
+@functools.lru_cache(maxsize=1 << 16)
+def name_key(name: str) -> str:
+    # What names are compared by: cleaned, without accents, case or
+    # punctuation, so "Jean-Pierre Lévy*" and "jean pierre levy" meet.
+    name = unicodedata.normalize("NFKD", clean_name(name))
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", name.casefold()).split())
+
+def create_index(db: sqlite3.Connection) -> None:
+    # The triggers call clean_name/name_key, so every connection that writes
+    # papers must register them (Corpus does).
+    db.create_function("clean_name", 1, clean_name, deterministic=True)
+    db.create_function("name_key", 1, name_key, deterministic=True)
+    indexed = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'paper_authors'").fetchone()
+    db.execute("""CREATE TABLE IF NOT EXISTS paper_authors (
+                      paper INTEGER NOT NULL,
+                      position INTEGER NOT NULL,
+                      name TEXT NOT NULL,
+                      key TEXT NOT NULL)""")
+    db.execute("CREATE INDEX IF NOT EXISTS paper_authors_key ON paper_authors (key, paper)")
+    db.execute("CREATE INDEX IF NOT EXISTS paper_authors_paper ON paper_authors (paper)")
+    db.execute("""CREATE TRIGGER IF NOT EXISTS paper_authors_ai AFTER INSERT ON papers BEGIN
+                      INSERT INTO paper_authors SELECT new.id, key, clean_name(value), name_key(value) FROM json_each(new.authors) WHERE name_key(value) != '';
+                  END""")
+    db.execute("""CREATE TRIGGER IF NOT EXISTS paper_authors_ad AFTER DELETE ON papers BEGIN
+                      DELETE FROM paper_authors WHERE paper = old.id;
+                  END""")
+    if indexed is None:
+        db.execute("""INSERT INTO paper_authors SELECT papers.id, each.key, clean_name(each.value), name_key(each.value)
+                      FROM papers, json_each(papers.authors) AS each WHERE name_key(each.value) != ''""")
+
+Paper = Tuple[str, int, str, str, List[str]]
+
+class AuthorIndex:
+    # Queries optionally restricted to some conferences and/or years.
+    def __init__(self,
+                 db          : sqlite3.Connection,
+                 conferences : Optional[List[str]] = None,
+                 years       : Optional[List[int]] = None
+                 ):
+        self.db = db
+        self.where = ""
+        self.params: list = []
+        if conferences:
+            self.where += f" AND papers.conference IN ({', '.join('?' * len(conferences))})"
+            self.params += conferences
+        if years:
+            self.where += f" AND papers.year IN ({', '.join('?' * len(years))})"
+            self.params += years
+
+    def display(self, keys: Iterable[str]) -> Dict[str, str]:
+        # The most common written form of each key.
+        keys = list(keys)
+        names = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.db.execute(f"SELECT key, name, COUNT(*) AS n FROM paper_authors WHERE key IN ({', '.join('?' * len(chunk))}) GROUP BY key, name ORDER BY n",
+                                   chunk)
+            names.update((key, name) for key, name, _ in rows)
+        return names
+
+    def papers_by(self, name: str) -> List[Paper]:
+        # (conference, year, track, title, authors) of every paper listing
+        # `name`, newest first.
+        rows = self.db.execute(f"""SELECT papers.conference, papers.year, papers.track, papers.title, papers.authors
+                                   FROM papers WHERE papers.id IN (SELECT paper FROM paper_authors WHERE key = ?){self.where}
+                                   ORDER BY papers.year DESC, papers.conference, papers.id""",
+                               [name_key(name)] + self.params)
+        return [(conference, year, track, title, [clean_name(author) for author in json.loads(authors)])
+                for conference, year, track, title, authors in rows]
+
+    def top_authors(self,
+                    condition : str,
+                    params    : list,
+                    limit     : int = 20
+                    ) -> List[Tuple[str, int]]:
+        # Authors with the most papers whose title satisfies `condition` (see
+        # corpus.title_filter), as (name, papers).
+        rows = self.db.execute(f"""SELECT paper_authors.key, COUNT(DISTINCT papers.id) AS n
+                                   FROM papers JOIN paper_authors ON paper_authors.paper = papers.id
+                                   WHERE ({condition}){self.where}
+                                   GROUP BY paper_authors.key ORDER BY n DESC, paper_authors.key LIMIT ?""",
+                               params + self.params + [limit]).fetchall()
+        names = self.display(key for key, _ in rows)
+        return [(names[key], n) for key, n in rows]
+
+    def coauthors(self,
+                  name  : str,
+                  depth : int = 1,
+                  limit : int = 50
+                  ) -> List[Tuple[str, int, int]]:
+        # Co-authors of `name` up to `depth` hops away, as (name, hops,
+        # shared papers with the previous hop), closest and most frequent
+        # first. Each further hop expands from the `limit` strongest ties of
+        # the previous one, so prolific co-authors do not pull in most of
+        # the corpus.
+        seen = {name_key(name): 0}
+        frontier = [name_key(name)]
+        found: List[Tuple[str, int, int]] = []
+        for hop in range(1, depth + 1):
+            counts: Dict[str, int] = {}
+            for start in range(0, len(frontier), 500):
+                chunk = frontier[start:start + 500]
+                rows = self.db.execute(f"""SELECT other.key, COUNT(DISTINCT other.paper)
+                                           FROM paper_authors AS author
+                                           JOIN paper_authors AS other ON other.paper = author.paper
+                                           JOIN papers ON papers.id = author.paper
+                                           WHERE author.key IN ({', '.join('?' * len(chunk))}){self.where}
+                                           GROUP BY other.key""",
+                                       chunk + self.params)
+                for key, n in rows:
+                    if key not in seen:
+                        counts[key] = counts.get(key, 0) + n
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            found += [(key, hop, n) for key, n in ranked]
+            seen.update((key, hop) for key in counts)
+            frontier = [key for key, _ in ranked[:limit]]
+            if len(found) >= limit or not frontier:
+                break
+        found = found[:limit]
+        names = self.display(key for key, _, _ in found)
+        return [(names[key], hop, n) for key, hop, n in found]
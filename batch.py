@@ -0,0 +1,84 @@
+import re
+
+from typing import Dict, List, Optional, Tuple
+
+from results import Results
+
+# --batch: a file of named keyword queries answered by a single crawl. Every
+# title is matched once against the union of all keywords, then split() hands
+# each query the papers, and matched keywords, that belong to it.
+#
+#   # name: keyword, keyword, ...
+#   diffusion: diffusion, score-based, denoising
+#   radiance: neural radiance, nerf, gaussian splatting
+
+Queries = Dict[str, List[str]]
+
+def read_queries(path: str) -> Queries:
+    queries: Queries = {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, separator, keywords = line.partition(":")
+            name = name.strip()
+            if not separator or not re.fullmatch(r"[\w-]+", name):
+                raise ValueError(f"{path}:{number}: expected 'name: keyword, keyword, ...' with a name of letters, digits, _ and -")
+            if name in queries:
+                raise ValueError(f"{path}:{number}: query {name} is defined twice")
+            queries[name] = [keyword.strip() for keyword in keywords.split(",") if keyword.strip()]
+            if not queries[name]:
+                raise ValueError(f"{path}:{number}: query {name} has no keywords")
+    if not queries:
+        raise ValueError(f"{path} has no queries")
+    return queries
+
+def keywords(queries: Queries) -> List[str]:
+    # The union matched by the crawl, in first-seen order.
+    return list(dict.fromkeys(keyword for words in queries.values() for keyword in words))
+
+def split(results : Results,
+          queries : Queries
+          ) -> Dict[str, Results]:
+    # `results` once per query, keeping only papers that matched one of its
+    # keywords, listed in the query's order. Each part is what a separate
+    # `-k` run with those keywords would have written.
+    owners: Dict[str, List[Tuple[str, int]]] = {}
+    for name, words in queries.items():
+        for position, word in enumerate(words):
+            owners.setdefault(word, []).append((name, position))
+
+    parts = {name: results.like() for name in queries}
+    for i, (track, title) in enumerate(zip(results.track_codes, results.titles)):
+        hits: Dict[str, List[Tuple[int, str]]] = {}
+        for keyword in results.keywords_of(i):
+            for name, position in owners.get(keyword, ()):
+                hits.setdefault(name, []).append((position, keyword))
+        if hits:
+            authors = results.authors_of(i)
+            for name, found in hits.items():
+                parts[name].append(track, title, authors, [keyword for _, keyword in sorted(found)])
+    return parts
+
+class BatchWriter:
+    # Fans every result out to one writer per query. `book`, if given, is
+    # the workbook holding all the per-query sheets and is saved last.
+    def __init__(self,
+                 queries : Queries,
+                 outputs : Dict[str, object],
+                 book    : Optional[object] = None
+                 ):
+        self.queries = queries
+        self.outputs = outputs
+        self.book = book
+
+    def write(self, results: Results) -> None:
+        for name, part in split(results, self.queries).items():
+            self.outputs[name].write(part)
+
+    def close(self) -> None:
+        for output in self.outputs.values():
+            output.close()
+        if self.book is not None:
+            self.book.close()
@@ -0,0 +1,139 @@
+import json
+import random
+import re
+import zlib
+
+from typing import List, Tuple
+from urllib.parse import unquote
+
+# Deterministic stand-ins for every listing page the venue registry reads,
+# with the same markup the extractors target. `size` is the number of papers
+# per listing (per session for OpenReview, per day for old CVF pages).
+
+WORDS = ["Diffusion", "Transformer", "Graph", "Robust", "Efficient", "Learning", "Neural", "Vision", "Language", "Models",
+         "3D", "Gaussian", "Splatting", "Reinforcement", "Attention", "Self-Supervised", "Contrastive", "Sparse", "Scalable", "Video"]
+
+def seed_of(*parts) -> int:
+    return zlib.crc32(repr(parts).encode()) % 100000
+
+def titles(seed: int, n: int) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))) + f" ({seed}-{i})" for i in range(n)]
+
+def authors(seed: int, i: int) -> List[str]:
+    rng = random.Random(seed * 7919 + i)
+    return [f"Author{seed}x{i}x{k} Surname{rng.randint(0, 999)}" for k in range(rng.randint(1, 8))]
+
+def ecva(size: int) -> str:
+    out = ["<html><body><div id=\"content\"><dl>"]
+    for year in [2018, 2020, 2022]:
+        for i, title in enumerate(titles(year, size)):
+            names = authors(year, i)
+            if year == 2018:
+                listed = " and ".join(", ".join(name.split()[::-1]) for name in names)
+            else:
+                listed = ", ".join(names)
+            out.append(f'<dt class="ptitle"><br><a href="papers/eccv_{year}/papers_ECCV/html/{i}_ECCV_{year}_paper.php">{title}</a></dt>\n'
+                       f'<dd>\n{listed}\n</dd>\n<dd>[<a href="pdf/{i}.pdf">pdf</a>] [<a href="supp/{i}.zip">supp</a>]</dd>\n')
+    return "".join(out) + "</dl></div></body></html>"
+
+def nips(year: int, size: int) -> str:
+    items = "".join(f'<li class="conference"><a title="paper title" href="/paper/{year}/hash/{i}-Abstract.html">{title}</a> '
+                    f'<i>{", ".join(authors(year, i))}</i></li>\n' for i, title in enumerate(titles(year, size)))
+    return f'<html><body><nav>menu</nav><div class="container-fluid"><div class="col"><ul class="paper-list">{items}</ul></div></div></body></html>'
+
+def openreview(venue: str, year: int, session: str, offset: int, limit: int, v2: bool, size: int) -> str:
+    seed = seed_of(venue, year, session)
+    count = size if session.lower() != "oral" else max(1, size // 10)
+    names = titles(seed, count)
+    notes = []
+    for i in range(offset, min(count, offset + limit)):
+        content = {"title": names[i], "authors": authors(seed, i), "abstract": "We study " * 40, "keywords": ["a", "b"], "pdf": f"/pdf?id={i}"}
+        if v2:
+            content = {key: {"value": value} for key, value in content.items()}
+        notes.append({"id": f"n{i}", "forum": f"n{i}", "content": content, "details": {"replyCount": 4, "presentation": [{"name": "x"}]}})
+    return json.dumps({"notes": notes, "count": count})
+
+def cvpr_accepted(size: int) -> str:
+    rows = ["<tr><th>Paper</th></tr><tr><td>header</td></tr>"]
+    for i, title in enumerate(titles(2024, size)):
+        listed = " · ".join(f"{name} (University {i % 50})" for name in authors(2024, i))
+        cell = f"<strong>{title}</strong>" if i % 2 else f'<a href="/virtual/2024/poster/{i}">{title}</a>'
+        rows.append(f'<tr><td>{cell}<div class="indented"><i>{listed}</i></div></td><td>Poster</td></tr>\n')
+    return "<html><body><table>" + "".join(rows) + "<tr><td>footer</td></tr><tr><td>footer</td></tr></table></body></html>"
+
+def cvf(venue: str, year: int, day: str, size: int) -> str:
+    # Pages before ICCV 2019 have no leading <dd> (extract.cvf skip=0).
+    lead = "" if venue == "ICCV" and year < 2019 else '<dd><form>bibtex search</form></dd>'
+    seed = seed_of(venue, year, day)
+    out = [f'<html><body><div id="content"><dl>{lead}']
+    for i, title in enumerate(titles(seed, size)):
+        listed = ",".join(f'<form class="authsearch"><a href="#">{name}</a></form>' for name in authors(seed, i))
+        out.append(f'<dt class="ptitle"><br><a href="/content/{venue}{year}/html/{i}.html">{title}</a></dt>\n'
+                   f'<dd>\n{listed}\n</dd>\n<dd>[<a href="/pdf/{i}.pdf">pdf</a>] [<a href="/supp/{i}.zip">supp</a>]</dd>\n')
+    return "".join(out) + "</dl></div></body></html>"
+
+def icml(year: int, size: int) -> str:
+    results = [{"id": i, "name": title, "authors": [{"fullname": name, "institution": "Uni"} for name in authors(year, i)],
+                "eventtype": "Oral" if i % 10 == 0 else "Poster", "abstract": "We study " * 40, "sourceid": i}
+               for i, title in enumerate(titles(year, size))]
+    return json.dumps({"count": size, "results": results})
+
+def pmlr_index() -> str:
+    items = "".join(f'<li><a href="v{100 + year - 2010}/">Proceedings of ICML {year}</a> Volume</li>'
+                    f'<li><a href="w{year}/">Proceedings of ICML {year} Workshop</a></li>' for year in range(2017, 2023))
+    items += "".join(f'<li><a href="v{year - 1990}/">ICML {year} Proceedings</a></li>' for year in range(2013, 2017))
+    return f'<html><body><ul class="proceedings-list"><li>Latest</li></ul><ul class="proceedings-list">{items}</ul></body></html>'
+
+def pmlr(volume: int, size: int) -> str:
+    papers = "".join(f'<div class="paper"><p class="title">{title}</p><p class="details"><span class="authors">{", ".join(authors(volume, i))}</span>; '
+                     f'<span class="info">PMLR {volume}:{i}-{i + 9}</span></p><p class="links">[abs] [pdf]</p></div>\n'
+                     for i, title in enumerate(titles(volume, size)))
+    return f"<html><body><main>{papers}</main></body></html>"
+
+def anthology_divs(div_ids: List[str], size: int) -> str:
+    out = ["<html><body>"]
+    for div_id in div_ids:
+        seed = seed_of(div_id)
+        out.append(f'<div id="{div_id}" class="card">')
+        out.append('<p class="d-sm-flex"><span class="d-block"><strong><a href="/volumes/x/">Proceedings front matter</a></strong></span></p>')
+        for i, title in enumerate(titles(seed, size)):
+            links = " | ".join(f'<a href="/people/{k}/">{name}</a>' for k, name in enumerate(authors(seed, i)))
+            out.append(f'<p class="d-sm-flex"><span class="d-block"><strong><a class="align-middle" href="/{i}/">{title}</a></strong><br>{links}</span></p>\n')
+        out.append("</div>")
+    return "".join(out) + "</body></html>"
+
+ANTHOLOGY_DIVS = {("acl", 2018): ["p18-1", "p18-2"], ("acl", 2019): ["p19-1"], ("acl", 2020): ["2020acl-main"],
+                  ("emnlp", 2018): ["d18-1"], ("emnlp", 2019): ["d19-1"]}
+
+def page(url: str, size: int) -> Tuple[str, str]:
+    # (content type, body) for `url`; KeyError for pages with no fixture.
+    u = unquote(url)
+    if "ecva.net/papers.php" in u:
+        return "text/html", ecva(size)
+    m = re.search(r"papers\.nips\.cc/paper/(\d+)", u)
+    if m:
+        return "text/html", nips(int(m[1]), size)
+    m = re.search(r"openreview\.net/notes\?content\.venue=(\w+)[ +](\d+)[ +]([^&]+)&.*offset=(\d+)&limit=(\d+)", u)
+    if m:
+        return "application/json", openreview(m[1], int(m[2]), m[3], int(m[4]), int(m[5]), "api2." in u, size)
+    if "cvpr.thecvf.com/Conferences/2024/AcceptedPapers" in u:
+        return "text/html", cvpr_accepted(size)
+    m = re.search(r"openaccess\.thecvf\.com/(CVPR|ICCV)(\d+)(?:\?day=(.*))?$", u)
+    if m:
+        return "text/html", cvf(m[1], int(m[2]), m[3] or "", size)
+    m = re.search(r"icml-(\d+)-orals-posters\.json", u)
+    if m:
+        return "application/json", icml(int(m[1]), size)
+    if re.search(r"proceedings\.mlr\.press/?$", u):
+        return "text/html", pmlr_index()
+    m = re.search(r"proceedings\.mlr\.press/v(\d+)/?$", u)
+    if m:
+        return "text/html", pmlr(int(m[1]), size)
+    m = re.search(r"aclanthology\.org/events/(acl|emnlp)-(\d+)/", u)
+    if m:
+        venue, year = m[1], int(m[2])
+        return "text/html", anthology_divs(ANTHOLOGY_DIVS.get((venue, year), [f"{year}{venue}-long", f"{year}{venue}-short", f"{year}{venue}-main"]), size)
+    if "emnlp-22-ingestion" in u:
+        return "text/html", anthology_divs(["2022emnlp-main"], size)
+    raise KeyError(url)
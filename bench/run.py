@@ -0,0 +1,289 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Callable, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import extract
+import fetch
+import fixtures
+import jsonstream
+import parsing
+import server
+import stats
+import venues
+from export import writers
+from matcher import KeywordMatcher
+from results import Results
+
+# Benchmarks the parsers, the JSON decoder, the exporters and full venue
+# crawls against the fixtures in fixtures.py, then compares the numbers with
+# a baseline and exits with 1 on a regression. The parsers group first checks
+# that the JSON decoder is exact however the bodies are split, and that the
+# extractors give clean author names.
+#
+#   python bench/run.py --save bench/baseline.json   # once, on this machine
+#   python bench/run.py                              # compare with it
+#
+# Throughput depends on the machine, so no baseline is shipped: record one
+# before changing the code (bench/baseline.json is ignored by git).
+#
+# Every case reports items per CPU second (best of --repeat samples) and the
+# tracemalloc peak of one extra run.
+
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+KEYWORDS = ["diffusion", "graph", "3d", "transformer"]
+
+# (extractor, fixture URL, kwargs) for every extractor in extract.py.
+PARSER_CASES = [
+    ("ecva", "https://www.ecva.net/papers.php", {}),
+    ("nips", "https://papers.nips.cc/paper/2021", {}),
+    ("cvpr_accepted", "https://cvpr.thecvf.com/Conferences/2024/AcceptedPapers", {}),
+    ("cvf", "https://openaccess.thecvf.com/CVPR2022?day=all", {}),
+    ("pmlr", "https://proceedings.mlr.press/v139", {}),
+    ("anthology", "https://aclanthology.org/events/acl-2022/", {"div_ids": ["2022acl-long", "2022acl-short"]}),
+]
+
+JSON_CASES = [
+    ("icml", "https://icml.cc/static/virtual/data/icml-2024-orals-posters.json", "results", venues.ICML_FIELDS),
+    ("openreview_v2", "https://api2.openreview.net/notes?content.venue=ICLR%202024%20poster&offset=0&limit=1000", "notes", venues.OPENREVIEW_V2),
+]
+
+# One (venue, year) per edition branch of the registry.
+CRAWL_CASES = [
+    ("cvpr", 2024), ("cvpr", 2022), ("cvpr", 2019), ("iccv", 2017),
+    ("acl", 2018), ("acl", 2022), ("emnlp", 2019), ("emnlp", 2022),
+    ("eccv", 2020), ("eccv", 2024),
+    ("neurips", 2021), ("neurips", 2022), ("neurips", 2023),
+    ("iclr", 2023), ("iclr", 2024),
+    ("icml", 2015), ("icml", 2019), ("icml", 2024),
+]
+
+def measure(run: Callable[[], int], repeat: int, min_seconds: float = 0.2) -> Dict:
+    # run() returns the number of items it processed. Time is the process's
+    # CPU time (all threads, not the fixture server), which unlike wall time
+    # is not inflated when a shared machine throttles us. Like timeit, each
+    # sample loops until it takes at least `min_seconds`, and the fastest of
+    # `repeat` samples is kept.
+    items = run()
+    loops = 1
+    while True:
+        start = time.process_time()
+        for _ in range(loops):
+            run()
+        elapsed = time.process_time() - start
+        if elapsed >= min_seconds:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.process_time()
+        for _ in range(loops):
+            run()
+        best = min(best, (time.process_time() - start) / loops)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"items": items, "cpu_seconds": best, "per_sec": items / best, "peak_kb": peak / 1024}
+
+Case = Callable[[], int]
+
+def parser_cases(size: int) -> Dict[str, Case]:
+    cases = {}
+    backends = ["bs4", "lxml"] if extract.DEFAULT_BACKEND == "lxml" else ["bs4"]
+    for name, url, kwargs in PARSER_CASES:
+        body = fixtures.page(url, size)[1].encode()
+        extractor = getattr(extract, name)
+        for backend in backends:
+            cases[f"{name}/{backend}"] = lambda extractor=extractor, body=body, backend=backend, kwargs=kwargs: len(extractor(body, "utf-8", backend, **kwargs))
+    for name, url, key, fields in JSON_CASES:
+        body = fixtures.page(url, size)[1].encode()
+        chunks = [body[i:i + fetch.JSON_CHUNK] for i in range(0, len(body), fetch.JSON_CHUNK)]
+        cases[f"{name}/jsonstream"] = lambda chunks=chunks, key=key, fields=fields: sum(1 for _ in jsonstream.records(chunks, key, fields))
+        cases[f"{name}/json.loads"] = lambda body=body, key=key: len(json.loads(body)[key])
+    return cases
+
+# Documents whose numbers are split mid-literal ("1." + "5") by a chunk
+# boundary; the decoder must not stop at the split.
+JSON_SPLITS = [
+    [b'{"notes":[1.', b'5],"count":1}'],
+    [b'{"notes":[1', b'e', b'-3, -', b'2E+2],"count":1', b'0}'],
+]
+
+def check_jsonstream(size: int, splits: int = 200) -> List[str]:
+    # jsonstream must give what json.loads gives however the body is cut
+    # into chunks.
+    problems = []
+    documents = [(chunks, "notes") for chunks in JSON_SPLITS]
+    rng = random.Random(0)
+    for name, url, key, _ in JSON_CASES:
+        body = fixtures.page(url, size)[1].encode()
+        for _ in range(splits):
+            cuts = sorted(rng.sample(range(1, len(body)), rng.randint(1, 50)))
+            documents.append(([body[a:b] for a, b in zip([0] + cuts, cuts + [len(body)])], key))
+    for chunks, key in documents:
+        body = b"".join(chunks)
+        expected = json.loads(body)
+        extra: Dict = {}
+        try:
+            found = list(jsonstream.records(chunks, key, extra=extra))
+        except ValueError as e:
+            found = repr(e)
+        if found != expected[key] or extra != {name: value for name, value in expected.items() if name != key}:
+            problems.append(f"jsonstream decodes {body[:40]!r}... differently when split at {[len(chunk) for chunk in chunks][:8]}")
+    return problems
+
+def check_extractors(size: int) -> List[str]:
+    # Every extractor, with every backend, gives author names without
+    # surrounding whitespace and no empty names.
+    problems = []
+    backends = ["bs4", "lxml"] if extract.DEFAULT_BACKEND == "lxml" else ["bs4"]
+    for name, url, kwargs in PARSER_CASES:
+        body = fixtures.page(url, size)[1].encode()
+        for backend in backends:
+            rows = getattr(extract, name)(body, "utf-8", backend, **kwargs)
+            bad = [author for row in rows for author in row[-1] if not author or author != author.strip()]
+            if bad:
+                problems.append(f"{name}/{backend} gives {len(bad)} author names with surrounding whitespace, e.g. {bad[0]!r}")
+    return problems
+
+def sample_results(size: int) -> List[Results]:
+    matcher = KeywordMatcher(KEYWORDS)
+    samples = []
+    for year in range(2014, 2024):
+        results = Results()
+        track = results.add_track(f"BENCH {year}")
+        for i, title in enumerate(fixtures.titles(year, size)):
+            results.append(track, title, fixtures.authors(year, i), matcher.match(title))
+        samples.append(results)
+    return samples
+
+def exporter_cases(size: int, directory: str) -> Dict[str, Case]:
+    cases = {}
+    samples = sample_results(size)
+    def export(writer_class: type, path: str) -> int:
+        writer = writer_class(path)
+        for results in samples:
+            writer.write(results)
+        writer.close()
+        return sum(len(results) for results in samples)
+    for name, writer_class in writers.items():
+        path = os.path.join(directory, f"bench.{name}")
+        try:
+            writer_class(path).close()
+        except SystemExit as e:
+            # Optional dependency (e.g. pyarrow) not installed.
+            print(f"skipping {name}: {e}", file=sys.stderr)
+            continue
+        cases[name] = lambda writer_class=writer_class, path=path: export(writer_class, path)
+    return cases
+
+@contextlib.contextmanager
+def crawl_cases(size: int) -> Iterator[Dict[str, Case]]:
+    # Full venues.get_papers runs over HTTP against the fixture server, with
+    # rate limiting off and no HTTP cache.
+    process, port = server.start(size)
+    fetch.configure(8, 0, 60, 1)
+    fetch.get_session().mount("https://", server.LocalAdapter(port, pool_connections=8, pool_maxsize=64))
+    matcher = KeywordMatcher(KEYWORDS)
+    def crawl(venue: str, year: int) -> int:
+        # Shared index pages (ECVA, PMLR, ICML JSON) are memoized per run;
+        # forget them so every run fetches and parses them again.
+        fetch.forget()
+        scanned = len(stats.tracks)
+        with contextlib.redirect_stderr(io.StringIO()):
+            venues.get_papers(venue, year, matcher)
+        return sum(track["scanned"] for track in stats.tracks[scanned:])
+    try:
+        yield {f"{venue}/{year}": lambda venue=venue, year=year: crawl(venue, year) for venue, year in CRAWL_CASES}
+    finally:
+        process.terminate()
+
+def regressed(result: Dict, base: Dict, tolerance: float) -> List[str]:
+    # Slower throughput or a larger peak than `tolerance` allows.
+    problems = []
+    if result["per_sec"] < base["per_sec"] * (1 - tolerance):
+        problems.append(f"{result['per_sec']:.0f}/s vs baseline {base['per_sec']:.0f}/s")
+    if result["peak_kb"] > base["peak_kb"] * (1 + tolerance) + 64:
+        problems.append(f"peak {result['peak_kb']:.0f} kB vs baseline {base['peak_kb']:.0f} kB")
+    return problems
+
+def best_of(first: Dict, second: Dict) -> Dict:
+    return {**first, "per_sec": max(first["per_sec"], second["per_sec"]), "peak_kb": min(first["peak_kb"], second["peak_kb"])}
+
+def print_table(results: Dict[str, Dict[str, Dict]], baseline: Optional[Dict]) -> None:
+    print(f"{'group':<10} {'case':<26} {'items':>7} {'items/cpu s':>11} {'peak kB':>9} {'vs base':>8}")
+    for group, cases in results.items():
+        for case, result in cases.items():
+            base = (baseline or {}).get(group, {}).get(case)
+            ratio = f"{result['per_sec'] / base['per_sec']:.2f}x" if base else ""
+            print(f"{group:<10} {case:<26} {result['items']:>7} {result['per_sec']:>11.0f} {result['peak_kb']:>9.0f} {ratio:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default=500, type=int, help="papers per fixture listing")
+    parser.add_argument("--repeat", default=5, type=int, help="timed samples per case (the fastest is kept)")
+    parser.add_argument("--only", default="parsers,exporters,crawl", type=str, help="comma separated groups to run")
+    parser.add_argument("--baseline", default=BASELINE, type=str, help="baseline JSON to compare with")
+    parser.add_argument("--tolerance", default=0.3, type=float, help="allowed relative slowdown or peak memory growth")
+    parser.add_argument("--confirm", default=2, type=int, help="re-measurements of a case before it is reported as a regression")
+    parser.add_argument("--save", default=None, type=str, help="write the results as a new baseline")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    parsing.set_workers(0)
+    baseline = None
+    if args.save is None:
+        if not os.path.exists(args.baseline):
+            sys.exit(f"no baseline at {args.baseline}: record one on this machine first with --save {args.baseline}")
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("size") != args.size:
+            sys.exit(f"{args.baseline} was recorded with --size {baseline.get('size')}")
+
+    groups = args.only.split(",")
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as directory, contextlib.ExitStack() as stack:
+        cases = {}
+        if "parsers" in groups:
+            regressions += check_jsonstream(args.size) + check_extractors(args.size)
+            cases["parsers"] = parser_cases(args.size)
+        if "exporters" in groups:
+            cases["exporters"] = exporter_cases(args.size, directory)
+        if "crawl" in groups:
+            cases["crawl"] = stack.enter_context(crawl_cases(args.size))
+        for group, runs in cases.items():
+            results[group] = {}
+            for case, run in runs.items():
+                result = measure(run, args.repeat)
+                base = (baseline or {}).get(group, {}).get(case)
+                # Shared machines are noisy: a case only regresses if it is
+                # still too slow (or too large) when measured again.
+                for _ in range(args.confirm):
+                    if base is None or not regressed(result, base, args.tolerance):
+                        break
+                    result = best_of(result, measure(run, args.repeat))
+                results[group][case] = result
+                if base is not None:
+                    regressions += [f"{group} {case}: {problem}" for problem in regressed(result, base, args.tolerance)]
+
+    print_table(results, baseline)
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump({"size": args.size, **results}, f, indent=1)
+        print(f"baseline written to {args.save}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,58 @@
+import multiprocessing
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+import requests
+import requests.adapters
+
+import fixtures
+
+# A local stand-in for the real listing hosts. The server runs in its own
+# process (so it does not show up in the benchmark's timings or tracemalloc
+# peaks) and answers http://127.0.0.1:PORT/<host>/<path> with the fixture of
+# https://<host>/<path>. LocalAdapter rewrites the crawler's requests to it.
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    size = 1000
+    cache = {}
+
+    def do_GET(self):
+        url = "https://" + self.path.lstrip("/")
+        if url not in self.cache:
+            try:
+                self.cache[url] = fixtures.page(url, self.size)
+            except KeyError:
+                self.send_error(404)
+                return
+        content_type, body = self.cache[url]
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(size: int, port_queue: multiprocessing.Queue) -> None:
+    FixtureHandler.size = size
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def start(size: int) -> Tuple[multiprocessing.Process, int]:
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(size, port_queue), daemon=True)
+    process.start()
+    return process, port_queue.get(timeout=30)
+
+class LocalAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, port: int, **kwargs):
+        super().__init__(**kwargs)
+        self.port = port
+
+    def send(self, request, **kwargs):
+        request.url = f"http://127.0.0.1:{self.port}/" + request.url.split("://", 1)[1]
+        return super().send(request, **kwargs)
@@ -0,0 +1,79 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import Corpus
+from results import Results
+
+# Times how long main.py takes to start for commands that never touch the
+# network, and checks that they do not import the crawling and parsing
+# dependencies (those are imported on first use).
+#
+#   python bench/startup.py
+#
+# Exits with 1 when a command is slower than --budget milliseconds above a
+# bare `python -c pass`, or imports one of HEAVY.
+
+HEAVY = ["requests", "bs4", "lxml", "openpyxl", "tqdm", "httpx", "pyarrow", "numpy", "cProfile", "concurrent.futures"]
+
+def commands(directory: str) -> Dict[str, List[str]]:
+    db = os.path.join(directory, "papers.sqlite")
+    return {
+        "python -c pass": ["-c", "pass"],
+        "main.py --help": [os.path.join(ROOT, "main.py"), "--help"],
+        "main.py query --help": [os.path.join(ROOT, "main.py"), "query", "--help"],
+        "main.py query (csv)": [os.path.join(ROOT, "main.py"), "query", "-c", "cvpr", "-y", "2023", "-k", "diffusion", "--db", db, "-f", "csv"],
+    }
+
+def sample_corpus(directory: str) -> None:
+    corpus = Corpus(os.path.join(directory, "papers.sqlite"))
+    results = Results()
+    track = results.add_track("CVPR 2023")
+    for i in range(200):
+        results.append(track, f"Paper {i} on {'diffusion' if i % 3 else 'graphs'}", ["A. Author", "B. Author"])
+    corpus.store("cvpr", 2023, results)
+
+def run(args: List[str], directory: str, repeat: int) -> Tuple[float, List[str]]:
+    # Best wall time of `repeat` runs, and the heavy modules the last run
+    # imported (from -X importtime).
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        done = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=directory,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    imported = set(re.findall(r"^import time:\s+\d+ \|\s+\d+ \|\s*(\S+)$", done.stderr, re.M))
+    return best, [name for name in HEAVY if name in imported]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", default=10, type=int, help="runs per command (the fastest is kept)")
+    parser.add_argument("--budget", default=60, type=float, help="allowed milliseconds above python -c pass")
+    args = parser.parse_args()
+
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        sample_corpus(directory)
+        results = {name: run(command, directory, args.repeat) for name, command in commands(directory).items()}
+    interpreter = results["python -c pass"][0]
+    print(f"{'command':<24} {'ms':>6} {'+ms':>6}  heavy imports")
+    for name, (seconds, heavy) in results.items():
+        extra = (seconds - interpreter) * 1000
+        print(f"{name:<24} {seconds * 1000:>6.0f} {extra:>6.0f}  {', '.join(heavy)}")
+        if extra > args.budget:
+            problems.append(f"{name}: {extra:.0f} ms above the interpreter")
+        if heavy:
+            problems.append(f"{name}: imports {', '.join(heavy)}")
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
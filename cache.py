@@ -0,0 +1,166 @@
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+from urllib.parse import unquote, urlparse
+
+if TYPE_CHECKING:
+    import requests
+
+FOREVER = None
+
+# Seconds after which a cached response for the host is revalidated. Listings
+# whose URL names a past year are final and are kept forever regardless.
+HOST_TTL = {
+    "api.openreview.net"    : 6 * 3600,
+    "api2.openreview.net"   : 6 * 3600,
+    "www.ecva.net"          : 24 * 3600,
+    "proceedings.mlr.press" : 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+
+class OfflineCacheMiss(Exception):
+    pass
+
+def url_year(url: str) -> Optional[int]:
+    years = [int(y) for y in re.findall(r"(?<!\d)((?:19|20)\d\d)(?!\d)", unquote(url))]
+    return max(years) if years else None
+
+def default_ttl(url: str) -> Optional[float]:
+    year = url_year(url)
+    if year is not None and year < datetime.date.today().year:
+        return FOREVER
+    return HOST_TTL.get(urlparse(url).netloc, DEFAULT_TTL)
+
+class HttpCache:
+    def __init__(self,
+                 cache_dir  : str = ".cache/http",
+                 max_bytes  : int = 1 << 30,
+                 offline    : bool = False,
+                 ttl        : Callable[[str], Optional[float]] = default_ttl,
+                 ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                               url TEXT PRIMARY KEY,
+                               digest TEXT NOT NULL,
+                               size INTEGER NOT NULL,
+                               encoding TEXT,
+                               etag TEXT,
+                               last_modified TEXT,
+                               fetched_at REAL NOT NULL,
+                               accessed_at REAL NOT NULL)""")
+        self.db.commit()
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        with self.lock:
+            row = self.db.execute("SELECT digest, size, encoding, etag, last_modified, fetched_at FROM entries WHERE url = ?", (url,)).fetchone()
+        if row is None or not os.path.exists(self.object_path(row[0])):
+            return None
+        keys = ["digest", "size", "encoding", "etag", "last_modified", "fetched_at"]
+        return dict(zip(keys, row))
+
+    def is_fresh(self, url: str, entry: Dict) -> bool:
+        ttl = self.ttl(url)
+        return ttl is FOREVER or time.time() - entry["fetched_at"] < ttl
+
+    def response(self, url: str, entry: Dict, stream: bool = False) -> "requests.Response":
+        import requests
+        res = requests.Response()
+        if stream:
+            # iter_content reads the cached file in chunks through res.raw.
+            res.raw = open(self.object_path(entry["digest"]), "rb")
+        else:
+            with open(self.object_path(entry["digest"]), "rb") as f:
+                res._content = f.read()
+        with self.lock:
+            self.db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        res.status_code = 200
+        res.url = url
+        res.encoding = entry["encoding"]
+        res.from_cache = True
+        return res
+
+    def store(self, url: str, res: "requests.Response") -> None:
+        content = res.content
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (url, digest, len(content), res.encoding, res.headers.get("ETag"), res.headers.get("Last-Modified"), now, now))
+            self.db.commit()
+        self.evict()
+
+    def touch(self, url: str) -> None:
+        now = time.time()
+        with self.lock:
+            self.db.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self.db.commit()
+
+    def evict(self) -> None:
+        # Bodies are shared between URLs with identical content, so the size
+        # budget is counted over distinct digests.
+        with self.lock:
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            removed = []
+            for url, digest, size in self.db.execute("SELECT url, digest, size FROM entries ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                if self.db.execute("SELECT 1 FROM entries WHERE digest = ?", (digest,)).fetchone() is None:
+                    removed.append(digest)
+                    total -= size
+            self.db.commit()
+        for digest in removed:
+            if os.path.exists(self.object_path(digest)):
+                os.remove(self.object_path(digest))
+
+    def get(self,
+            url     : str,
+            download: Callable[..., "requests.Response"],
+            stream  : bool = False
+            ) -> "requests.Response":
+        entry = self.lookup(url)
+        if self.offline:
+            if entry is None:
+                raise OfflineCacheMiss(url)
+            return self.response(url, entry, stream)
+        if entry is not None and self.is_fresh(url, entry):
+            return self.response(url, entry, stream)
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        res = download(url, headers=headers)
+        if res.status_code == 304 and entry is not None:
+            self.touch(url)
+            return self.response(url, entry, stream)
+        if res.status_code == 200:
+            self.store(url, res)
+        return res
@@ -0,0 +1,230 @@
+import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+from typing import Iterable, List, Optional, Tuple
+
+from authors import AuthorIndex, create_index
+from results import Results
+
+def like_pattern(keyword: str) -> str:
+    escaped = keyword.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def fts_query(expression: str) -> str:
+    # Translates a user query into FTS5 syntax. Bare words and "quoted
+    # phrases" are matched as case-insensitive substrings of the title and
+    # combined with AND (implicit), OR, NOT and parentheses. Raises
+    # ValueError for queries FTS5 would reject.
+    if expression.count('"') % 2:
+        raise ValueError("unbalanced quotes")
+    parts = []
+    for term, operator in split_query(expression):
+        if operator:
+            parts.append(term)
+            continue
+        if len(term) < 3:
+            raise ValueError(f"search terms need at least 3 characters (use -k for shorter keywords): {term!r}")
+        parts.append('"' + term.replace('"', '""') + '"')
+    check_syntax(parts)
+    return " ".join(parts)
+
+def split_query(expression: str) -> List[Tuple[str, bool]]:
+    # (term, is operator) for every word, "quoted phrase", operator and
+    # parenthesis of a -q query.
+    return [(quoted, False) if quoted else (word, word in ["AND", "OR", "NOT", "(", ")"])
+            for quoted, word in re.findall(r'"([^"]*)"|([^\s()"]+|[()])', expression)]
+
+def positive_terms(expression: str) -> List[str]:
+    # The words and phrases of a -q query that matching titles contain, i.e.
+    # all but the operands of NOT (a term or a parenthesized group).
+    terms = []
+    depth = 0
+    negated = None  # depth of the NOT group being skipped
+    after_not = False
+    for term, operator in split_query(expression):
+        if not operator:
+            if negated is None and not after_not:
+                terms.append(term)
+            after_not = False
+        elif term == "NOT":
+            after_not = True
+        elif term == "(":
+            depth += 1
+            if after_not and negated is None:
+                negated = depth
+            after_not = False
+        elif term == ")":
+            if negated == depth:
+                negated = None
+            depth -= 1
+    return list(dict.fromkeys(terms))
+
+def check_syntax(parts: List[str]) -> None:
+    # expression := term ((AND | OR | NOT)? term)*, term := phrase | ( expression ).
+    # NOT is binary in FTS5 ("a NOT b"), so it cannot start an expression.
+    position = 0
+    def term() -> None:
+        nonlocal position
+        if position == len(parts):
+            raise ValueError("the query ends where a search term is expected")
+        part = parts[position]
+        position += 1
+        if part == "(":
+            expression()
+            if position == len(parts) or parts[position] != ")":
+                raise ValueError("unbalanced parentheses")
+            position += 1
+        elif part in ["AND", "OR", "NOT", ")"]:
+            raise ValueError(f"expected a search term before {part}")
+    def expression() -> None:
+        nonlocal position
+        term()
+        while position < len(parts) and parts[position] != ")":
+            if parts[position] in ["AND", "OR", "NOT"]:
+                position += 1
+            term()
+    expression()
+    if position < len(parts):
+        raise ValueError("unbalanced parentheses")
+
+def title_filter(keywords  : Iterable[str] = (),
+                 expression: Optional[str] = None
+                 ) -> Tuple[str, list]:
+    # SQL condition on `papers` (and its parameters): any of `keywords`, or
+    # the boolean `expression`, occurs in the title.
+    keywords = list(keywords)
+    match = None
+    if expression is not None:
+        match = fts_query(expression)
+    elif keywords and all(len(k) >= 3 for k in keywords):
+        match = " OR ".join('"' + k.replace('"', '""') + '"' for k in keywords)
+    if match is not None:
+        return "papers.id IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)", [match]
+    # The trigram index cannot match terms shorter than 3 characters.
+    where = " OR ".join(["lower(papers.title) LIKE ? ESCAPE '\\'"] * len(keywords)) or "1"
+    return where, [like_pattern(k) for k in keywords]
+
+class Corpus:
+    def __init__(self, path: str = "papers.sqlite"):
+        self.db = sqlite3.connect(path)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS papers (
+                               id INTEGER PRIMARY KEY,
+                               conference TEXT NOT NULL,
+                               year INTEGER NOT NULL,
+                               track TEXT NOT NULL,
+                               title TEXT NOT NULL,
+                               authors TEXT NOT NULL,
+                               source TEXT)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS papers_venue ON papers (conference, year)")
+        # Trigram full-text index over titles, kept in sync by triggers so a
+        # crawl of new years only indexes the rows it adds.
+        indexed = self.db.execute("SELECT 1 FROM sqlite_master WHERE name = 'papers_fts'").fetchone()
+        self.db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(title, content='papers', content_rowid='id', tokenize='trigram')")
+        self.db.execute("""CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+                               INSERT INTO papers_fts (rowid, title) VALUES (new.id, new.title);
+                           END""")
+        self.db.execute("""CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+                               INSERT INTO papers_fts (papers_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                           END""")
+        if indexed is None:
+            self.db.execute("INSERT INTO papers_fts (papers_fts) VALUES ('rebuild')")
+        create_index(self.db)
+        # What was crawled, when, and a hash of its content per track.
+        self.db.execute("""CREATE TABLE IF NOT EXISTS manifest (
+                               conference TEXT NOT NULL,
+                               year INTEGER NOT NULL,
+                               track TEXT NOT NULL,
+                               crawled_at REAL NOT NULL,
+                               content_hash TEXT NOT NULL,
+                               papers INTEGER NOT NULL,
+                               PRIMARY KEY (conference, year, track))""")
+        self.db.commit()
+
+    def is_final(self,
+                 conference : str,
+                 year       : int
+                 ) -> bool:
+        # A venue is final once it has been crawled after its year ended;
+        # until then (e.g. the current year's OpenReview venues) it may change.
+        crawled = self.db.execute("SELECT MIN(crawled_at) FROM manifest WHERE conference = ? AND year = ?", (conference, year)).fetchone()[0]
+        return crawled is not None and datetime.date.fromtimestamp(crawled).year > year
+
+    def store(self,
+              conference: str,
+              year      : int,
+              results   : Results,
+              commit    : bool = True
+              ) -> Results:
+        # A crawl replaces everything previously stored for (conference, year).
+        # Returns the papers that were not stored before, in the same tracks.
+        # With commit=False the change stays in the open transaction until
+        # commit(), e.g. until the delta has been saved.
+        previous = dict(self.db.execute("SELECT track, content_hash FROM manifest WHERE conference = ? AND year = ?", (conference, year)).fetchall())
+        rows = []
+        manifest = []
+        delta = results.like()
+        now = time.time()
+        for code, (track, source) in enumerate(zip(results.tracks, results.sources)):
+            papers = [(results.titles[i].strip(), results.authors_of(i)) for i in results.in_track(code)]
+            content_hash = hashlib.sha256(json.dumps(papers).encode()).hexdigest()
+            manifest.append((conference, year, track, now, content_hash, len(papers)))
+            for title, authors in papers:
+                rows.append((conference, year, track, title, json.dumps(authors), source))
+            if previous.get(track) == content_hash:
+                continue
+            known = {title for title, in self.db.execute("SELECT title FROM papers WHERE conference = ? AND year = ? AND track = ?", (conference, year, track))}
+            for title, authors in papers:
+                if title not in known:
+                    delta.append(code, title, authors)
+        try:
+            # Unchanged content keeps its rows (and full-text index entries).
+            if {m[2]: m[4] for m in manifest} != previous:
+                self.db.execute("DELETE FROM papers WHERE conference = ? AND year = ?", (conference, year))
+                self.db.executemany("INSERT INTO papers (conference, year, track, title, authors, source) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.db.execute("DELETE FROM manifest WHERE conference = ? AND year = ?", (conference, year))
+            self.db.executemany("INSERT INTO manifest VALUES (?, ?, ?, ?, ?, ?)", manifest)
+        except BaseException:
+            self.db.rollback()
+            raise
+        if commit:
+            self.db.commit()
+        return delta
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def count(self,
+              conference: str,
+              year      : int
+              ) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM papers WHERE conference = ? AND year = ?", (conference, year)).fetchone()[0]
+
+    def authors(self,
+                conferences : Optional[List[str]] = None,
+                years       : Optional[List[int]] = None
+                ) -> AuthorIndex:
+        return AuthorIndex(self.db, conferences, years)
+
+    def query(self,
+              conference: str,
+              year      : int,
+              keywords  : Iterable[str] = (),
+              expression: str = None
+              ) -> Results:
+        # Either any of `keywords` or the boolean `expression` must occur in
+        # the title. Papers come back track by track in crawl order, with no
+        # keywords (see Results.match).
+        condition, params = title_filter(keywords, expression)
+        cursor = self.db.execute(f"SELECT track, title, authors FROM papers WHERE conference = ? AND year = ? AND ({condition}) ORDER BY id",
+                                 [conference, year] + params)
+        results = Results()
+        codes = {}
+        for track, title, authors in cursor:
+            if track not in codes:
+                codes[track] = results.add_track(track)
+            results.append(codes[track], title, json.loads(authors))
+        return results
@@ -0,0 +1,138 @@
+import re
+import unicodedata
+import zlib
+
+from typing import Dict, List, Set, Tuple
+
+from results import Results
+
+# --dedup: one row per paper, however many venues, tracks or sessions list it.
+# Titles that are equal once normalized are merged by hashing; near-duplicates
+# (a changed word, a typo, a reworded subtitle) are found with MinHash over
+# character trigrams and banded LSH, so only titles sharing a band are ever
+# compared, then confirmed by their actual trigram similarity.
+
+BINS = 32       # MinHash values per title (one-permutation hashing)
+ROWS = 4        # values per LSH band: 8 bands catch ~98% of pairs at 0.8
+THRESHOLD = 0.8 # trigram Jaccard similarity needed to merge
+CROWDED = 64    # bands shared by more titles than this are not compared
+
+def normalize(title: str) -> str:
+    if not title.isascii():
+        title = unicodedata.normalize("NFKD", title)
+        title = "".join(ch for ch in title if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w]+", " ", title.casefold()).split())
+
+def trigrams(text: str) -> Set[int]:
+    # Byte trigrams of the UTF-8 text, hashed with crc32 so that results do
+    # not depend on the process's string hash seed.
+    padded = f" {text} ".encode()
+    crc32 = zlib.crc32
+    return {crc32(padded[i:i + 3]) for i in range(len(padded) - 2)}
+
+def signature(shingles: Set[int]) -> Tuple[int, ...]:
+    # One hash per trigram, split into BINS buckets by its low bits; the
+    # minimum of each bucket stands in for one of BINS permutations. Short
+    # titles leave buckets empty; those borrow the next non-empty bucket's
+    # value (offset by the distance), so they do not all collide.
+    mins = [-1] * BINS
+    for h in sorted(shingles, reverse=True):
+        mins[h % BINS] = h // BINS
+    if not shingles:
+        return tuple(mins)
+    filled = list(mins)
+    for b in range(BINS):
+        distance = 1
+        while filled[b] < 0:
+            value = mins[(b + distance) % BINS]
+            if value >= 0:
+                filled[b] = value + (distance << 32)
+            distance += 1
+    return tuple(filled)
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def groups(titles: List[str]) -> List[List[int]]:
+    # Indices of `titles` grouped by paper, each group and the list in
+    # first-seen order. Union-find: every group's root is its first index.
+    parent: Dict[int, int] = {}
+    def find(i: int) -> int:
+        while i in parent:
+            i = parent[i]
+        return i
+    def union(i: int, j: int) -> None:
+        i, j = find(i), find(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+
+    # Exact duplicates after normalization.
+    first: Dict[str, int] = {}
+    for i, title in enumerate(titles):
+        key = normalize(title)
+        if key in first:
+            union(first[key], i)
+        else:
+            first[key] = i
+
+    # Near duplicates among the distinct normalized titles.
+    keys = list(first)
+    shingles = [trigrams(key) for key in keys]
+    numbers = [re.findall(r"\d+", key) for key in keys]
+    buckets: Dict[Tuple, List[int]] = {}
+    for k, s in enumerate(shingles):
+        values = signature(s)
+        for band in range(0, BINS, ROWS):
+            buckets.setdefault((band, values[band:band + ROWS]), []).append(k)
+    compared: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        # A band shared by many titles says little (true duplicates share
+        # several bands), and comparing them all would be quadratic.
+        if len(members) > CROWDED:
+            continue
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                a, b = members[x], members[y]
+                if (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                # Titles that differ in a number ("... 2", "v3") are kept apart.
+                if numbers[a] == numbers[b] and jaccard(shingles[a], shingles[b]) >= THRESHOLD:
+                    union(first[keys[a]], first[keys[b]])
+
+    grouped: Dict[int, List[int]] = {}
+    for i in range(len(titles)):
+        grouped.setdefault(find(i), []).append(i)
+    return list(grouped.values())
+
+def merge(results: Results) -> Results:
+    # One paper per group: the first title and author list seen, every
+    # distinct track joined with "; ", and the union of matched keywords.
+    merged = Results()
+    labels: Dict[str, int] = {}
+    for group in groups(results.titles):
+        tracks = list(dict.fromkeys(results.tracks[results.track_codes[i]] for i in group))
+        label = "; ".join(tracks)
+        if label not in labels:
+            labels[label] = merged.add_track(label)
+        keywords = list(dict.fromkeys(keyword for i in group for keyword in results.keywords_of(i)))
+        merged.append(labels[label], results.titles[group[0]].strip(), results.authors_of(group[0]), keywords)
+    return merged
+
+class DedupWriter:
+    # Collects every result of the run, then writes the deduplicated papers
+    # to `writer` on close.
+    def __init__(self, writer: object):
+        self.writer = writer
+        self.results = Results()
+        self.tracks: Dict[str, int] = {}
+
+    def write(self, results: Results) -> None:
+        for track, title, authors, keywords in results:
+            if track not in self.tracks:
+                self.tracks[track] = self.results.add_track(track)
+            self.results.append(self.tracks[track], title, authors, keywords)
+
+    def close(self) -> None:
+        self.writer.write(merge(self.results))
+        self.writer.close()
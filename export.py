@@ -0,0 +1,125 @@
+import csv
+import json
+
+from array import array
+from typing import Dict
+
+from results import Results
+
+# Column names shared by every output format.
+FIELDS = ["conference", "title", "authors", "keywords"]
+
+def append_rows(sheet, results: Results) -> None:
+    for track, paper, authors, matched in results:
+        sheet.append([track, paper, "; ".join(authors), ", ".join(matched)])
+
+class XlsxWriter:
+    # Write-only workbook: rows are streamed to disk as each result arrives,
+    # so memory does not grow with the number of papers.
+    def __init__(self, save_path: str):
+        import openpyxl
+        self.save_path = save_path
+        self.wb = openpyxl.Workbook(write_only=True)
+        self.sheet = self.wb.create_sheet()
+
+    def write(self, results: Results) -> None:
+        append_rows(self.sheet, results)
+
+    def close(self) -> None:
+        self.wb.save(self.save_path)
+
+class XlsxSheet:
+    # Writer for one sheet of an XlsxBook; the book saves the file.
+    def __init__(self, sheet):
+        self.sheet = sheet
+
+    def write(self, results: Results) -> None:
+        append_rows(self.sheet, results)
+
+    def close(self) -> None:
+        pass
+
+class XlsxBook:
+    # One write-only workbook with a sheet per name (--batch --sheets).
+    def __init__(self, save_path: str):
+        import openpyxl
+        self.save_path = save_path
+        self.wb = openpyxl.Workbook(write_only=True)
+
+    def sheet(self, name: str) -> XlsxSheet:
+        # Excel limits sheet titles to 31 characters.
+        return XlsxSheet(self.wb.create_sheet(name[:31]))
+
+    def close(self) -> None:
+        self.wb.save(self.save_path)
+
+class CsvWriter:
+    def __init__(self, save_path: str):
+        self.f = open(save_path, "wt", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(FIELDS)
+
+    def write(self, results: Results) -> None:
+        for track, paper, authors, matched in results:
+            self.writer.writerow([track, paper, "; ".join(authors), ", ".join(matched)])
+
+    def close(self) -> None:
+        self.f.close()
+
+class JsonlWriter:
+    def __init__(self, save_path: str):
+        self.f = open(save_path, "wt", encoding="utf-8")
+
+    def write(self, results: Results) -> None:
+        for row in results:
+            self.f.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        self.f.close()
+
+class ParquetWriter:
+    # Each result becomes one row group; authors and keywords are list<string>
+    # columns. Requires pyarrow.
+    def __init__(self, save_path: str):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("--format parquet requires pyarrow (pip install pyarrow)")
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([("conference", pyarrow.string()),
+                                      ("title", pyarrow.string()),
+                                      ("authors", pyarrow.list_(pyarrow.string())),
+                                      ("keywords", pyarrow.list_(pyarrow.string()))])
+        self.writer = pyarrow.parquet.ParquetWriter(save_path, self.schema)
+
+    def codes(self, values: list, codes: array, code_type) -> object:
+        # The strings at `codes`, taken from the table without building a
+        # Python string per row.
+        indices = self.pa.Array.from_buffers(code_type, len(codes), [None, self.pa.py_buffer(codes)])
+        return self.pa.array(values, self.pa.string()).take(indices)
+
+    def nested(self, ends: array, codes: array, values: list, code_type) -> object:
+        offsets = self.pa.array([0, *ends], self.pa.int32())
+        return self.pa.ListArray.from_arrays(offsets, self.codes(values, codes, code_type))
+
+    def write(self, results: Results) -> None:
+        # Columns are built straight from the Results arrays.
+        if not len(results):
+            return
+        pa = self.pa
+        columns = [self.codes(results.tracks, results.track_codes, pa.uint16()),
+                   pa.array(results.titles, pa.string()),
+                   self.nested(results.author_ends, results.author_codes, results.authors.values, pa.uint32()),
+                   self.nested(results.keyword_ends, results.keyword_codes, results.keywords.values, pa.uint16())]
+        self.writer.write_table(pa.table(columns, schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+writers: Dict[str, type] = {
+    "xlsx"    : XlsxWriter,
+    "csv"     : CsvWriter,
+    "jsonl"   : JsonlWriter,
+    "parquet" : ParquetWriter,
+}
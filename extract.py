@@ -0,0 +1,200 @@
+import importlib.util
+import re
+
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+# Extractors turn the raw bytes of a listing page into compact
+# (title, authors) tuples. They are plain module-level functions so that
+# parsing.extract can run them in worker processes.
+#
+# Each extractor has two backends: "lxml", which uses XPath on a C-built
+# tree (or a pull parser that never builds the whole tree), and "bs4", the
+# original pure-Python BeautifulSoup path, kept as a fallback. Both are
+# imported by the first extractor that needs them, not at startup.
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+Paper = Tuple[str, List[str]]
+
+DEFAULT_BACKEND = "lxml" if importlib.util.find_spec("lxml") is not None else "bs4"
+_string = None
+
+def text_of(element) -> str:
+    # Same as lxml.html's text_content(), for the plain elements the pull
+    # parser yields: descendant text without comments.
+    global _string
+    if _string is None:
+        import lxml.etree
+        _string = lxml.etree.XPath("string()")
+    return _string(element)
+
+def make_soup(content: bytes, encoding: Optional[str]) -> "BeautifulSoup":
+    from bs4 import BeautifulSoup
+    if encoding is not None:
+        return BeautifulSoup(content.decode(encoding, errors="replace"), "html.parser")
+    return BeautifulSoup(content, "html.parser")
+
+def make_tree(content: bytes, encoding: Optional[str]):
+    import lxml.html
+    return lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+
+def has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def iter_dt_dd(content  : bytes,
+               encoding : Optional[str]
+               ) -> Iterator:
+    # Yields every dt/dd element once it is closed and then frees it, so the
+    # multi-megabyte CVF and ECVA listings are never held as a whole tree.
+    import lxml.etree
+    parser = lxml.etree.HTMLPullParser(events=("end",), tag=("dt", "dd"), encoding=encoding)
+    for start in range(0, len(content), 1 << 16):
+        parser.feed(content[start:start + (1 << 16)])
+        for _, element in parser.read_events():
+            yield element
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    parser.close()
+    for _, element in parser.read_events():
+        yield element
+
+def ecva(content : bytes,
+         encoding: Optional[str],
+         backend : str = "bs4"
+         ) -> List[Tuple[int, str, List[str]]]:
+    # (year, title, authors) for every ECCV year listed on ecva.net.
+    if backend == "lxml":
+        papers, authors = [], []
+        for element in iter_dt_dd(content, encoding):
+            if element.tag == "dd":
+                authors.append(text_of(element))
+            elif element.get("class") == "ptitle":
+                links = element.xpath(".//a/@href")
+                papers.append((links[0] if links else "", text_of(element)))
+    else:
+        soup = make_soup(content, encoding)
+        papers = [(paper.find("a")["href"], paper.text) for paper in soup.findAll("dt", {"class": "ptitle"})]
+        authors = [author.text for author in soup.findAll("dd")]
+    assert len(papers) == len(authors) // 2
+
+    rows = []
+    for i, (href, title) in enumerate(papers):
+        year = re.search(r"eccv_(\d+)", href)
+        if year is None:
+            continue
+        year = int(year.group(1))
+        if year == 2018:
+            author = authors[i * 2].split("and")
+            for j in range(len(author)):
+                author[j] = author[j].strip().split(',')
+                author[j][0], author[j][1] = author[j][1].strip(), author[j][0].strip()
+                author[j] = " ".join(author[j])
+        else:
+            author = [a.strip() for a in authors[i * 2].split(",")]
+        rows.append((year, title, author))
+    return rows
+
+def nips(content: bytes, encoding: Optional[str], backend: str = "bs4") -> List[Paper]:
+    if backend == "lxml":
+        tree = make_tree(content, encoding)
+        container = tree.xpath(f"//div[{has_class('container-fluid')}]")[0]
+        return [(paper.xpath(".//a")[0].text_content(), paper.xpath(".//i")[0].text_content().split(", ")) for paper in container.iter("li")]
+    soup = make_soup(content, encoding)
+    papers = []
+    for paper in soup.find_all("div", {"class": "container-fluid"})[0].findAll("li"):
+        title = paper.findAll("a")
+        authors = paper.findAll("i")
+        papers.append((title[0].text, authors[0].text.split(", ")))
+    return papers
+
+def cvpr_accepted(content: bytes, encoding: Optional[str], backend: str = "bs4") -> List[Paper]:
+    if backend == "lxml":
+        papers = []
+        for paper in make_tree(content, encoding).xpath("//tr")[2:-2]:
+            title = paper.xpath("(.//strong)[1]") or paper.xpath("(.//a)[1]")
+            authors = paper.xpath("(.//i)[1]")[0].text_content().strip().split("·")
+            papers.append((title[0].text_content().strip(), [author.split("(")[0].strip() for author in authors]))
+        return papers
+    soup = make_soup(content, encoding)
+    papers = []
+    for paper in soup.find_all("tr")[2:-2]:
+        title = paper.find("strong")
+        if title is None:
+            title = paper.find("a")
+        authors = paper.find("i").text.strip().split("·")
+        papers.append((title.text.strip(), [author.split("(")[0].strip() for author in authors]))
+    return papers
+
+def names(text: str) -> List[str]:
+    # "A,\n B, C" -> ["A", "B", "C"]; the dd text keeps the page's line breaks.
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+def cvf(content: bytes, encoding: Optional[str], backend: str = "bs4", skip: int = 1) -> List[Paper]:
+    # openaccess.thecvf.com: a dt.ptitle per paper followed by two dd
+    # (authors, links); most pages have `skip` leading dd before the first.
+    if backend == "lxml":
+        papers, authors = [], []
+        for element in iter_dt_dd(content, encoding):
+            if element.tag == "dd":
+                authors.append(text_of(element))
+            elif element.get("class") == "ptitle":
+                papers.append(text_of(element))
+        authors = authors[skip:]
+        return [(paper, names(authors[i * 2])) for i, paper in enumerate(papers)]
+    soup = make_soup(content, encoding)
+    papers = soup.find_all("dt", {"class": "ptitle"})
+    authors = soup.find_all("dd")[skip:]
+    return [(paper.text, names(authors[i * 2].text)) for i, paper in enumerate(papers)]
+
+def pmlr_proceedings(content: bytes, encoding: Optional[str], backend: str = "bs4") -> List[Tuple[str, str]]:
+    # (text, href) of every volume on proceedings.mlr.press.
+    if backend == "lxml":
+        proceedings_list = make_tree(content, encoding).xpath(f"//ul[{has_class('proceedings-list')}]")[1].iter("li")
+        return [(proceeding.text_content(), proceeding.xpath("(.//a)[1]/@href")[0]) for proceeding in proceedings_list]
+    soup = make_soup(content, encoding)
+    proceedings_list = soup.find_all("ul", {"class": "proceedings-list"})[1].find_all("li")
+    return [(proceeding.text, proceeding.find("a")["href"]) for proceeding in proceedings_list]
+
+def pmlr(content: bytes, encoding: Optional[str], backend: str = "bs4") -> List[Paper]:
+    if backend == "lxml":
+        papers = []
+        for paper in make_tree(content, encoding).xpath(f"//div[{has_class('paper')}]"):
+            title = paper.xpath(f"(.//p[{has_class('title')}])[1]")[0].text_content()
+            authors = paper.xpath(f"(.//p[{has_class('details')}])[1]//span[{has_class('authors')}]")[0].text_content().split(",")
+            papers.append((title, [a.strip() for a in authors]))
+        return papers
+    soup = make_soup(content, encoding)
+    papers = []
+    for paper in soup.find_all("div", {"class": "paper"}):
+        title = paper.find("p", {"class": "title"}).text
+        authors = paper.find("p", {"class": "details"}).find("span", {"class": "authors"}).text.split(",")
+        papers.append((title, [a.strip() for a in authors]))
+    return papers
+
+def anthology(content: bytes, encoding: Optional[str], backend: str = "bs4", div_ids: Optional[List[str]] = None) -> List[Paper]:
+    # ACL Anthology: span.d-block entries with the title link first and one
+    # link per author, inside the given volume divs (or the whole page).
+    if backend == "lxml":
+        tree = make_tree(content, encoding)
+        span = f"span[{has_class('d-block')}]"
+        if div_ids is None:
+            spans = tree.xpath(f"//{span}")
+        else:
+            spans = [element for div_id in div_ids for element in tree.xpath("//div[@id=$id]", id=div_id)[0].xpath(f".//{span}")]
+        papers = []
+        for paper in spans:
+            a_list = paper.xpath(".//a")
+            papers.append((a_list[0].text_content(), [a.text_content() for a in a_list[1:]]))
+        return papers
+    soup = make_soup(content, encoding)
+    if div_ids is None:
+        spans = soup.find_all("span", {"class": "d-block"})
+    else:
+        spans = [span for div_id in div_ids for span in soup.find_all("div", {"id": div_id})[0].find_all("span", {"class": "d-block"})]
+    papers = []
+    for paper in spans:
+        a_list = paper.find_all("a")
+        papers.append((a_list[0].text, [a.text for a in a_list[1:]]))
+    return papers
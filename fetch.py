@@ -0,0 +1,246 @@
+import random
+import threading
+import time
+
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+import jsonstream
+import stats
+from cache import HttpCache
+
+# requests is imported on first use: it is the slowest import at startup and
+# commands that never touch the network (query, --help) do not need it.
+if TYPE_CHECKING:
+    import requests
+
+# Maximum number of requests in flight per host. Several getters share the
+# same host (openaccess.thecvf.com, aclanthology.org, api.openreview.net), so
+# the limit is applied here rather than per job.
+host_limit = 2
+# Requests per second allowed per host (0 disables rate limiting).
+host_rate = 4.0
+timeout = (10, 60)
+retries = 5
+backoff = 1.0
+RETRY_STATUS = [429, 500, 502, 503, 504]
+JSON_CHUNK = 1 << 16
+
+_host_semaphores: Dict[str, threading.Semaphore] = {}
+_host_buckets: Dict[str, "TokenBucket"] = {}
+_host_lock = threading.Lock()
+
+cache: Optional[HttpCache] = None
+# Alternative transport (see async_backend.py); None uses the requests session.
+backend = None
+
+_memo: Dict[object, object] = {}
+_memo_locks: Dict[object, threading.Lock] = {}
+_memo_lock = threading.Lock()
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Takes a token and returns how long the caller has to wait for it.
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+def new_session(pool_size: int) -> "requests.Session":
+    # One keep-alive connection pool per host, shared by every getter.
+    import requests
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+session: Optional["requests.Session"] = None
+
+def get_session() -> "requests.Session":
+    global session
+    with _host_lock:
+        if session is None:
+            session = new_session(host_limit)
+        return session
+
+def configure(limit     : int = 2,
+              rate      : float = 4.0,
+              timeouts  : float = 60,
+              attempts  : int = 5,
+              ) -> None:
+    global host_limit, host_rate, timeout, retries, session
+    with _host_lock:
+        host_limit = max(1, limit)
+        host_rate = rate
+        timeout = (min(10, timeouts), timeouts)
+        retries = max(1, attempts)
+        _host_semaphores.clear()
+        _host_buckets.clear()
+        session = None
+
+def set_cache(http_cache: Optional[HttpCache]) -> None:
+    global cache
+    cache = http_cache
+
+def set_backend(transport) -> None:
+    global backend
+    backend = transport
+
+def host_semaphore(url: str) -> threading.Semaphore:
+    host = urlparse(url).netloc
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.Semaphore(host_limit)
+        return _host_semaphores[host]
+
+def host_bucket(url: str) -> Optional[TokenBucket]:
+    if host_rate <= 0:
+        return None
+    host = urlparse(url).netloc
+    with _host_lock:
+        if host not in _host_buckets:
+            _host_buckets[host] = TokenBucket(host_rate, max(1, host_rate))
+        return _host_buckets[host]
+
+def retry_after(res: "requests.Response") -> Optional[float]:
+    value = res.headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    import email.utils
+    try:
+        return max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int) -> float:
+    return backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+def download(url     : str,
+             headers : Optional[Dict[str, str]] = None,
+             stream  : bool = False
+             ) -> "requests.Response":
+    if backend is not None:
+        return backend.download(url, headers)
+    import requests
+    # Retries connection errors and 429/5xx responses with exponential backoff
+    # and jitter, honouring Retry-After when the server sends one.
+    for attempt in range(retries):
+        bucket = host_bucket(url)
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            with host_semaphore(url):
+                res = get_session().get(url, headers=headers, timeout=timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries - 1:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        if res.status_code not in RETRY_STATUS or attempt == retries - 1:
+            break
+        delay = retry_after(res)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        res.close()
+        time.sleep(delay)
+    res.raise_for_status()
+    return res
+
+def get(url: str, stream: bool = False) -> "requests.Response":
+    # With stream=True the body is read lazily through res.iter_content when
+    # it comes straight from the network or from a cached file.
+    start = time.perf_counter()
+    if cache is not None:
+        res = cache.get(url, download, stream)
+    else:
+        res = download(url, stream=stream)
+    # Streamed bodies are counted by decode_records as they are read.
+    size = None if stream else len(res.content)
+    res.fetch_event = stats.record_fetch(url, time.perf_counter() - start, size, getattr(res, "from_cache", False), res.status_code)
+    return res
+
+def counted(chunks: Iterator[bytes], res: "requests.Response") -> Iterator[bytes]:
+    event = getattr(res, "fetch_event", None)
+    if event is None or event["bytes"] is not None:
+        yield from chunks
+        return
+    for chunk in chunks:
+        stats.add_bytes(event, len(chunk))
+        yield chunk
+
+def decode_records(res     : "requests.Response",
+                   key     : str,
+                   fields  : Optional[Dict[str, str]] = None,
+                   extra   : Optional[Dict] = None
+                   ) -> Iterator[Dict]:
+    # Streams the records of the `key` array instead of decoding the whole
+    # document; see jsonstream.records.
+    # Responses built in memory (e.g. by the async backend) have no raw stream.
+    chunks = res.iter_content(JSON_CHUNK) if res.raw is not None else [res.content]
+    try:
+        yield from jsonstream.records(counted(chunks, res), key, fields, extra)
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"{res.url} did not return the expected JSON: {e}")
+    finally:
+        # Streamed bodies (network or a cached file) are read through res.raw.
+        if res.raw is not None:
+            res.raw.close()
+
+def iter_json(url     : str,
+              key     : str,
+              fields  : Optional[Dict[str, str]] = None,
+              extra   : Optional[Dict] = None
+              ) -> Iterator[Dict]:
+    return decode_records(get(url, stream=True), key, fields, extra)
+
+def memoize(key: object, compute: Callable[[], object]) -> object:
+    # Computes `key` once per run. Concurrent callers asking for the same key
+    # wait for the first one instead of fetching and parsing it again.
+    with _memo_lock:
+        if key in _memo:
+            return _memo[key]
+        lock = _memo_locks.setdefault(key, threading.Lock())
+    with lock:
+        if key not in _memo:
+            _memo[key] = compute()
+    return _memo[key]
+
+def forget() -> None:
+    # Drops every memoized value, e.g. between benchmark runs.
+    with _memo_lock:
+        _memo.clear()
+        _memo_locks.clear()
+
+def get_many(urls: List[str], workers: int = 8) -> List["requests.Response"]:
+    # Responses are returned in the order of `urls`; each URL is retried on
+    # its own so one failing page does not restart the whole listing.
+    if len(urls) <= 1:
+        return [get(url) for url in urls]
+    if backend is not None:
+        if cache is None:
+            responses = backend.download_many(urls)
+            for url, res in zip(urls, responses):
+                stats.record_fetch(url, res.elapsed.total_seconds(), len(res.content), False, res.status_code)
+            return responses
+        # Threads only wait on the event loop here, so use one per URL.
+        workers = max(workers, min(len(urls), 64))
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        return list(executor.map(stats.carry(get), urls))
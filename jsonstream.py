@@ -0,0 +1,121 @@
+import codecs
+import json
+import re
+
+from typing import Dict, Iterable, Iterator, Optional
+
+# Streams the records of one top-level array (e.g. "results" or "notes") out
+# of a JSON object as the bytes arrive, keeping only the requested fields of
+# each record. Every record is decoded by json's C scanner (raw_decode) as
+# soon as its bytes are buffered, so neither the whole text nor the whole
+# object graph is ever held.
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+def pick(record: Dict, path: str) -> object:
+    # "authors.fullname" maps over lists, giving every author's fullname.
+    value = record
+    for part in path.split("."):
+        if isinstance(value, list):
+            value = [item[part] for item in value]
+        else:
+            value = value[part]
+    return value
+
+def project(record: Dict, fields: Optional[Dict[str, str]]) -> Dict:
+    if fields is None:
+        return record
+    return {name: pick(record, path) for name, path in fields.items()}
+
+class Scanner:
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.done = False
+
+    def more(self) -> bool:
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            if not self.done:
+                self.done = True
+                self.buffer += self.decoder.decode(b"", final=True)
+            return False
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> object:
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # A number that ends the buffer, or stops at a character that
+            # could continue it ("1." + "5"), may go on in the next chunk.
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not self.done
+                    and (end == len(self.buffer) or self.buffer[end] in NUMBER_CHARS) and self.more()):
+                continue
+            self.pos = end
+            return value
+
+def scan(chunks  : Iterable[bytes],
+         key     : str,
+         extra   : Optional[Dict]
+         ) -> Iterator[Dict]:
+    scanner = Scanner(chunks)
+    scanner.expect("{")
+    while True:
+        char = scanner.peek()
+        if char == "}":
+            return
+        if char == ",":
+            scanner.pos += 1
+            continue
+        name = scanner.value()
+        scanner.expect(":")
+        if name != key:
+            value = scanner.value()
+            if extra is not None:
+                extra[name] = value
+            continue
+        scanner.expect("[")
+        while True:
+            char = scanner.peek()
+            if char == "]":
+                scanner.pos += 1
+                break
+            if char == ",":
+                scanner.pos += 1
+                continue
+            yield scanner.value()
+
+def records(chunks  : Iterable[bytes],
+            key     : str,
+            fields  : Optional[Dict[str, str]] = None,
+            extra   : Optional[Dict] = None
+            ) -> Iterator[Dict]:
+    # `fields` maps output names to dotted paths into each record; top-level
+    # scalars outside the array (e.g. "count") are stored into `extra`.
+    for record in scan(chunks, key, extra):
+        yield project(record, fields)
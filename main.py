@@ -1,14 +1,26 @@
 import argparse
-import json
+import atexit
+import re
+import sqlite3
 import sys
-import openpyxl
-import requests
 import os
-import csv
-
-from bs4 import BeautifulSoup
-from tqdm import tqdm
-from typing import Dict, List
+import time
+
+from typing import List
+
+import batch
+import extract
+import fetch
+import parsing
+import stats
+import venues
+from authors import AuthorIndex
+from cache import HttpCache
+from corpus import Corpus, fts_query, positive_terms, title_filter
+from dedup import DedupWriter
+from export import XlsxBook, writers
+from matcher import MATCH_MODES, KeywordMatcher, new_matcher
+from scheduler import run_jobs
 
 def process_conferences(conferences: List[str]) -> List[str]:
     temp = []
@@ -45,807 +57,257 @@ def upper_title(title: str) -> str:
     else:
         return title.upper()
 
-def get_eccv(year       : int,
-             keywords   : List[str]
-            ) -> Dict:
-    if year == 2024:
-        parsed = {"conference": f"ECCV {year}", "papers": [], "authors": []}
-        with open("data_eccv2024.csv", "rt") as f:
-            reader = csv.reader(f)
-            for row in tqdm(reader):
-                found = False
-                for keyword in keywords:
-                    if keyword.lower() in row[0].lower():
-                        found = True
-                        break
-                if found:
-                    parsed["papers"].append(row[0])
-                    parsed["authors"].append([author.replace("*", "") for author in row[1].split("; ")])
-
-
-    else:
-        res = requests.get("https://www.ecva.net/papers.php")
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        papers = soup.findAll("dt", {"class": "ptitle"})
-        authors = soup.findAll("dd")
-        assert len(papers) == len(authors) // 2
-
-        indices = []
-        parsed = {"conference": f"ECCV {year}", "papers": [], "authors": []}
-        for i, paper in tqdm(enumerate(papers)):
-            if f"eccv_{year}" in paper.find("a")["href"]:
-                for keyword in keywords:
-                    if keyword.lower() in paper.text or keyword.upper() in paper.text or keyword.capitalize() in paper.text:
-                        parsed["papers"].append(paper.text.strip())
-                        indices.append(i)
-                        break
-            else:
-                continue
-                    
-        for idx in indices:
-            # parsed["authors"]
-            if year in [2020, 2022]:
-                author = authors[idx * 2].text.split(",")
-                for j in range(len(author)):
-                    author[j] = author[j].strip()
-                parsed["authors"].append(author)
-            elif year in [2018]:
-                author = authors[idx * 2].text.split("and")
-                for j in range(len(author)):
-                    author[j] = author[j].strip().split(',')
-                    author[j][0], author[j][1] = author[j][1].strip(), author[j][0].strip()
-                    author[j] = " ".join(author[j])
-                parsed["authors"].append(author)
-            else:
-                raise NotImplementedError
-    return parsed
-
-def get_neurips(year     : int,
-                keywords : List[str]
-                ) -> Dict:
-    if year == 2023 or year == 2024:
-        parsed_oral = {"conference": f"NeurIPS {year} Oral", "papers": [], "authors": []}
-        parsed_spotlight = {"conference": f"NeurIPS {year} Spotlight", "papers": [], "authors": []}
-        parsed_poster = {"conference": f"NeurIPS {year} Poster", "papers": [], "authors": []}
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20oral&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 100
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20oral&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_oral["papers"].append(title)
-                        parsed_oral["authors"].append(row["content"]["authors"]["value"])
-                    pbar.update(1)
-                offset += limit
-        
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20spotlight&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 400
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20spotlight&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_spotlight["papers"].append(title)
-                        parsed_spotlight["authors"].append(row["content"]["authors"]["value"])
-                    pbar.update(1)
-                offset += limit
-        
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20poster&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{year}%20poster&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_poster["papers"].append(title)
-                        parsed_poster["authors"].append(row["content"]["authors"]["value"])
-                    pbar.update(1)
-                offset += limit
-        
-        return parsed_oral, parsed_spotlight, parsed_poster
-    
-    elif year == 2022:
-        parsed = {"conference": f"NeurIPS {year}", "papers": [], "authors": []}
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=NeurIPS+{year}+Accept&details=replyCount&offset=0&limit=1000&invitation=NeurIPS.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=NeurIPS+{year}+Accept&details=replyCount&offset={offset}&limit={limit}&invitation=NeurIPS.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for note in res_json["notes"]:
-                    title = note["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    
-                    if keyword_found:
-                        parsed["papers"].append(title)
-                        parsed["authors"].append(note["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        
-        return parsed
-
-        
-    else:
-        parsed = {"conference": f"NeurIPS {year}", "papers": [], "authors": []}
-        res = requests.get(f"https://papers.nips.cc/paper/{year}")
-        soup = BeautifulSoup(res.text, "html.parser")
-        for i, paper in tqdm(enumerate(soup.find_all("div", {"class":"container-fluid"})[0].findAll("li"))):
-            title = paper.findAll("a")
-            authors = paper.findAll("i")
-            keyword_found = False
-            for keyword in keywords:
-                if keyword.lower() in title[0].text or keyword.upper() in title[0].text or keyword.capitalize() in title[0].text:
-                    keyword_found = True
-                    break
-            if keyword_found:
-                parsed["papers"].append(title[0].text)
-                parsed["authors"].append(authors[0].text.split(", "))
-    return parsed
-
-def get_iclr(year           : int,
-             keywords       : List[str],
-             ) -> Dict:
-    if year == 2024:
-        parsed_poster = {"conference": f"ICLR {year}", "papers": [], "authors": []}
-        parsed_spotlight = {"conference": f"ICLR {year} spotlight", "papers": [], "authors": []}
-        parsed_oral = {"conference": f"ICLR {year} oral", "papers": [], "authors": []}
-        # poster session
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20poster&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20poster&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_poster["papers"].append(row["content"]["title"]["value"])
-                        parsed_poster["authors"].append(row["content"]["authors"]["value"])
-                        # parsed_poster["authors"].append(["Anonymous"])
-                    pbar.update(1)
-                offset += limit
-        # spotlight session
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20spotlight&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 300
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20spotlight&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_spotlight["papers"].append(row["content"]["title"]["value"])
-                        parsed_spotlight["authors"].append(row["content"]["authors"]["value"])
-                        # parsed_spotlight["authors"].append(["Anonymous"])
-                    pbar.update(1)
-                offset += limit
-        # oral session
-        res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20oral&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit=25&offset=0")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 50
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api2.openreview.net/notes?content.venue=ICLR%20{year}%20oral&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{year}%2FConference&limit={limit}&offset={offset}")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]["value"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title or keyword in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_oral["papers"].append(row["content"]["title"]["value"])
-                        parsed_oral["authors"].append(row["content"]["authors"]["value"])
-                        # parsed_oral["authors"].append(["Anonymous"])
-                    pbar.update(1)
-                offset += limit
-        return parsed_oral, parsed_spotlight, parsed_poster
-    elif year == 2023:
-        parsed_5 = {"conference": f"ICLR {year} top 5%", "papers": [], "authors": []}
-        parsed_25 = {"conference": f"ICLR {year} top 25%", "papers": [], "authors": []}
-        parsed_poster = {"conference": f"ICLR {year}", "papers": [], "authors": []}
-        # poster session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+poster&details=replyCount&offset=0&limit=25&invitation=ICLR.cc%2F2023%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+poster&details=replyCount&offset={offset}&limit={limit}&invitation=ICLR.cc%2F2023%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_poster["papers"].append(row["content"]["title"])
-                        parsed_poster["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        # top 25% session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+notable+top+25%25&details=replyCount&offset=0&limit=25&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+notable+top+25%25&details=replyCount&offset={offset}&limit={limit}&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_25["papers"].append(row["content"]["title"])
-                        parsed_25["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        # top 5% session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+notable+top+5%25&details=replyCount&offset=0&limit=25&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+notable+top+5%25&details=replyCount&offset={offset}&limit={limit}&invitation=ICLR.cc%2F2023%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_5["papers"].append(row["content"]["title"])
-                        parsed_5["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        return parsed_poster, parsed_25, parsed_5
-    else:
-        parsed_poster = {"conference": f"ICLR {year}", "papers": [], "authors": []}
-        parsed_spotlight = {"conference": f"ICLR {year} spotlight", "papers": [], "authors": []}
-        parsed_oral = {"conference": f"ICLR {year} oral", "papers": [], "authors": []}
-        # poster session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Poster&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Poster&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_poster["papers"].append(row["content"]["title"])
-                        parsed_poster["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        # spotlight session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Spotlight&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Spotlight&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_spotlight["papers"].append(row["content"]["title"])
-                        parsed_spotlight["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        # oral session
-        res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Oral&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-        res_json = json.loads(res.text)
-        max_count = res_json["count"]
-        offset = 0
-        limit = 1000
-        with tqdm(range(max_count)) as pbar:
-            while offset <= max_count:
-                res = requests.get(f"https://api.openreview.net/notes?content.venue=ICLR+{year}+Oral&details=replyCount&offset=0&limit=1000&invitation=ICLR.cc%2F{year}%2FConference%2F-%2FBlind_Submission")
-                res_json = json.loads(res.text)
-                for row in res_json["notes"]:
-                    title = row["content"]["title"]
-                    keyword_found = False
-                    for keyword in keywords:
-                        if keyword.lower() in title or keyword.upper() in title or keyword.capitalize() in title:
-                            keyword_found = True
-                            break
-                    if keyword_found:
-                        parsed_oral["papers"].append(row["content"]["title"])
-                        parsed_oral["authors"].append(row["content"]["authors"])
-                    pbar.update(1)
-                offset += limit
-        return parsed_poster, parsed_spotlight, parsed_oral
-
-
-def get_cvpr(year       : int,
-             keywords   : List[str]
-            ) -> Dict:
-    parsed = {"conference": f"CVPR {year}", "papers": [], "authors": []}
-    if year == 2024:
-        res = requests.get("https://cvpr.thecvf.com/Conferences/2024/AcceptedPapers")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("tr")[2:-2]
-        for i, paper in enumerate(papers):
-            title = paper.find("strong")
-            if title is None:
-                title = paper.find("a")
-            title = title.text.strip()
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    parsed["papers"].append(title)
-                    authors = paper.find("i").text.strip()
-                    authors = authors.split("·")
-                    authors = [author.split("(")[0].strip() for author in authors]
-                    parsed["authors"].append(authors)
-                    break
-
-
-    elif year in [2021, 2022, 2023]:
-        res = requests.get(f"https://openaccess.thecvf.com/CVPR{year}?day=all")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("dt", {"class": "ptitle"})
-        authors = soup.find_all("dd")[1:]
-        for i, paper in enumerate(tqdm(papers)):
-            for keyword in keywords:
-                if keyword.lower() in paper.text.lower():
-                    parsed["papers"].append(paper.text)
-                    parsed["authors"].append(authors[i * 2].text.split(","))
-                    break
-
-    elif year in [2018, 2019, 2020]:
-        dates = {2018: ["2018-06-19", "2018-06-20", "2018-06-21"],
-                 2019: ["2019-06-18", "2019-06-19", "2019-06-20"],
-                 2020: ["2020-06-16", "2020-06-17", "2020-06-18"]}
-        for date in dates[year]:
-            res = requests.get(f"https://openaccess.thecvf.com/CVPR{year}?day={date}")
-            soup = BeautifulSoup(res.text, "html.parser")
-            papers = soup.find_all("dt", {"class": "ptitle"})
-            authors = soup.find_all("dd")[1:]
-            for i, paper in enumerate(papers):
-                for keyword in keywords:
-                    if keyword.lower() in paper.text.lower():
-                        parsed["papers"].append(paper.text)
-                        parsed["authors"].append(authors[i * 2].text.split(","))
-                        break
+# Getters keep the (year, matcher) signature; the registry in venues.py
+# declares every venue's sources.
+conference = {name: venues.getter(name) for name in venues.venues}
 
+def output_name(conferences : List[str],
+                years       : List[int],
+                keywords    : List[str],
+                extension   : str = "xlsx"
+                ) -> str:
+    if not len(conferences) == len(list(conference.keys())):
+        upper_conference = "_".join([upper_title(c) for c in conferences])
     else:
-        res = requests.get(f"https://openaccess.thecvf.com/CVPR{year}")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("dt", {"class": "ptitle"})
-        authors = soup.find_all("dd")[1:]
-        for i, paper in enumerate(papers):
-            for keyword in keywords:
-                if keyword.lower() in paper.text.lower():
-                    parsed["papers"].append(paper.text)
-                    parsed["authors"].append(authors[i * 2].text.split(","))
-                    break
-    return parsed
-
-def get_iccv(year       : int,
-             keywords   : List[str]
-            ) -> Dict:
-    parsed = {"conference": f"ICCV {year}", "papers": [], "authors": []}
-
-    if year in [2021, 2023]:
-        res = requests.get(f"https://openaccess.thecvf.com/ICCV{year}?day=all")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("dt", {"class": "ptitle"})
-        authors = soup.find_all("dd")[1:]
-        for i, paper in enumerate(tqdm(papers)):
-            for keyword in keywords:
-                if keyword.lower() in paper.text.lower():
-                    parsed["papers"].append(paper.text)
-                    parsed["authors"].append(authors[i * 2].text.split(","))
-                    break
+        upper_conference = 'ALL'
 
-    elif year in [2019]:
-        dates = {2019: ["2019-10-29", "2019-10-30", "2019-10-31", "2019-11-01"]}
-        for date in dates[year]:
-            res = requests.get(f"https://openaccess.thecvf.com/ICCV{year}?day={date}")
-            soup = BeautifulSoup(res.text, "html.parser")
-            papers = soup.find_all("dt", {"class": "ptitle"})
-            authors = soup.find_all("dd")[1:]
-            for i, paper in enumerate(papers):
-                for keyword in keywords:
-                    if keyword.lower() in paper.text.lower():
-                        parsed["papers"].append(paper.text)
-                        parsed["authors"].append(authors[i * 2].text.split(","))
-                        break
+    years = "_".join([str(y) for y in years])
+    keywords = [k.lower() for k in keywords]
+    keywords = "_".join(sorted(keywords))
 
+    return f"{upper_conference}_{years}_{keywords}.{extension}"
+
+def add_fetch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("-w", "--workers", default=4, type=int, help="number of (conference, year) jobs crawled concurrently")
+    parser.add_argument("--per-host", default=2, type=int, help="maximum concurrent requests per host")
+    parser.add_argument("--rate", default=4.0, type=float, help="maximum requests per second per host (0 for no limit)")
+    parser.add_argument("--timeout", default=60, type=float, help="HTTP read timeout in seconds")
+    parser.add_argument("--retries", default=5, type=int, help="attempts per request on connection errors, 429 and 5xx")
+    parser.add_argument("--parse-workers", default=None, type=int, help="processes used to parse HTML pages (default: one per CPU, 0 parses in the crawling threads)")
+    parser.add_argument("--parser", default="auto", choices=["auto", "lxml", "bs4"], help="HTML parser used by the extractors (auto: lxml when installed)")
+    parser.add_argument("--backend", default="sync", choices=["sync", "async"], help="HTTP transport: a pooled requests session or one asyncio event loop (httpx)")
+    parser.add_argument("--cache-dir", default=".cache/http", type=str, help="directory of the on-disk HTTP cache")
+    parser.add_argument("--cache-size", default=1024, type=int, help="maximum size of the HTTP cache in MB")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch from the network")
+    parser.add_argument("--offline", action="store_true", help="serve every request from the HTTP cache only")
+
+def configure_fetch(args    : argparse.Namespace,
+                    parser  : argparse.ArgumentParser
+                    ) -> None:
+    if args.offline and args.no_cache:
+        parser.error("--offline requires the HTTP cache")
+
+    fetch.configure(args.per_host, args.rate, args.timeout, args.retries)
+    if args.backend == "async":
+        from async_backend import AsyncBackend
+        backend = AsyncBackend()
+        fetch.set_backend(backend)
+        atexit.register(backend.close)
+    if args.parser == "lxml" and extract.DEFAULT_BACKEND != "lxml":
+        parser.error("--parser lxml requires lxml")
+    parsing.set_backend(args.parser)
+    parsing.set_workers(args.parse_workers)
+    if not args.no_cache:
+        fetch.set_cache(HttpCache(args.cache_dir, args.cache_size << 20, args.offline))
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--report", default=None, type=str, metavar="PATH", help="write a JSON run report (fetch, parse, match and export times) and print a summary table")
+    parser.add_argument("--profile", default=None, type=str, metavar="PATH", help="profile the run with pyinstrument (HTML) if installed, else cProfile (pstats)")
+
+def add_batch_arguments(parser: argparse.ArgumentParser, match_group) -> None:
+    match_group.add_argument("--batch", default=None, type=str, metavar="FILE", help="file of named keyword queries ('name: keyword, keyword' per line), all answered by one crawl")
+    parser.add_argument("--sheets", action="store_true", help="with --batch, write one xlsx workbook with a sheet per query instead of one file per query")
+
+def batch_writer(args        : argparse.Namespace,
+                 conferences : List[str],
+                 years       : List[int],
+                 queries     : batch.Queries
+                 ) -> batch.BatchWriter:
+    book = None
+    if args.sheets:
+        stem = os.path.splitext(os.path.basename(args.batch))[0]
+        book = XlsxBook(output_name(conferences, years, [stem], "xlsx"))
+        outputs = {name: book.sheet(name) for name in queries}
     else:
-        res = requests.get(f"https://openaccess.thecvf.com/ICCV{year}")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("dt", {"class": "ptitle"})
-        authors = soup.find_all("dd")
-        for i, paper in enumerate(papers):
-            for keyword in keywords:
-                if keyword.lower() in paper.text.lower():
-                    parsed["papers"].append(paper.text)
-                    parsed["authors"].append(authors[i * 2].text.split(","))
-                    break
-    return parsed
-
-def get_icml(year       : int,
-             keywords   : List[str]
-            ) -> Dict:
-    parsed = {"conference": f"ICML {year}", "papers": [], "authors": []}
-    if year == 2024:
-        parsed_poster = {"conference": f"ICML {year} Poster", "papers": [], "authors": []}
-        parsed_oral = {"conference": f"ICML {year} Oral", "papers": [], "authors": []}
-        res = requests.get("https://icml.cc/static/virtual/data/icml-2024-orals-posters.json")
-        data = json.loads(res.text)
-        for i in tqdm(range(data['count'])):
-            title = data['results'][i]['name']
-            authors = [author['fullname'] for author in data['results'][i]['authors']]
-            eventtype = data['results'][i]['eventtype']
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    if eventtype == 'Poster':
-                        parsed_poster["papers"].append(title)
-                        parsed_poster["authors"].append(authors)
-                        break
-                    elif eventtype == 'Oral':
-                        parsed_oral["papers"].append(title)
-                        parsed_oral["authors"].append(authors)
-                        break
-        return parsed_poster, parsed_oral
-    elif year == 2023:
-        parsed_poster = {"conference": f"ICML {year} Poster", "papers": [], "authors": []}
-        parsed_oral = {"conference": f"ICML {year} Oral", "papers": [], "authors": []}
-        res = requests.get("https://icml.cc/static/virtual/data/icml-2023-orals-posters.json")
-        data = json.loads(res.text)
-        for i in tqdm(range(data['count'])):
-            title = data['results'][i]['name']
-            authors = [author['fullname'] for author in data['results'][i]['authors']]
-            eventtype = data['results'][i]['eventtype']
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    if eventtype == 'Poster':
-                        parsed_poster["papers"].append(title)
-                        parsed_poster["authors"].append(authors)
-                        break
-                    elif eventtype == 'Oral':
-                        parsed_oral["papers"].append(title)
-                        parsed_oral["authors"].append(authors)
-                        break
-        return parsed_poster, parsed_oral
-    elif year < 2023:
-        res = requests.get("https://proceedings.mlr.press")
-        soup = BeautifulSoup(res.text, "html.parser")
-        proceedings_list = soup.find_all("ul", {"class": "proceedings-list"})[1].find_all("li")
-        for proceeding in proceedings_list:
-            if year >= 2017:
-                if f"Proceedings of ICML {year}" in proceeding.text and "Workshop" not in proceeding.text:
-                    href = proceeding.find("a")["href"]
-                    break
-            else:
-                if f"ICML {year} Proceedings" in proceeding.text and "Workshop" not in proceeding.text:
-                    href = proceeding.find("a")["href"]
-                    break
-
-        res = requests.get(f"https://proceedings.mlr.press/{href}")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("div", {"class": "paper"})
-        for paper in tqdm(papers):
-            title = paper.find("p", {"class": "title"}).text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = paper.find("p", {"class": "details"}).find("span", {"class": "authors"}).text.split(",")
-                    authors = [a.strip() for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-        return parsed
-
-def get_acl(year    : int,
-            keywords: List[str]) -> Dict:
-    parsed = {"conference": f"ACL {year}", "papers": [], "authors": []}
-    if year >= 2021:
-        res = requests.get(f"https://aclanthology.org/events/acl-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        long_div = soup.find_all("div", {"id": f"{year}acl-long"})[0]
-        papers = long_div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-            
-
-        short_div = soup.find_all("div", {"id": f"{year}acl-short"})[0]
-        papers = short_div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-
-    elif year == 2020:
-        res = requests.get(f"https://aclanthology.org/events/acl-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        div = soup.find_all("div", {"id": f"{year}acl-main"})[0]
-        papers = div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-
-    elif year == 2019:
-        res = requests.get(f"https://aclanthology.org/events/acl-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        div = soup.find_all("div", {"id": f"p{str(year)[2:]}-1"})[0]
-        papers = div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-
-    elif year == 2018:
-        res = requests.get(f"https://aclanthology.org/events/acl-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        long_div = soup.find_all("div", {"id": f"p{str(year)[2:]}-1"})[0]
-        papers = long_div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-            
-        short_div = soup.find_all("div", {"id": f"p{str(year)[2:]}-2"})[0]
-        papers = short_div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-    
+        outputs = {name: writers[args.format](output_name(conferences, years, [name], args.format)) for name in queries}
+    if args.dedup:
+        outputs = {name: DedupWriter(output) for name, output in outputs.items()}
+    return batch.BatchWriter(queries, outputs, book)
+
+def add_match_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--match", default="substring", choices=MATCH_MODES,
+                        help="substring: keywords anywhere in the title; stem: whole words, ignoring plurals and -ing/-ed forms; fuzzy: stem, also allowing a typo or two in longer words")
+
+def print_authors(index: AuthorIndex, args: argparse.Namespace) -> None:
+    if args.by is not None:
+        papers = index.papers_by(args.by)
+        for conference, year, track, title, authors in papers:
+            print(f"{track}\t{title}\t{'; '.join(authors)}")
+        print(f"{len(papers)} papers by {args.by}", file=sys.stderr)
+    elif args.top is not None:
+        for name, papers in index.top_authors(*title_filter(args.top), limit=args.limit):
+            print(f"{papers:>5}  {name}")
     else:
-        raise
-    
-    return parsed
+        for name, hops, papers in index.coauthors(args.coauthors, args.depth, args.limit):
+            print(f"{hops}  {papers:>4}  {name}")
 
-def get_emnlp(year    : int,
-              keywords: List[str]) -> Dict:
-    parsed = {"conference": f"EMNLP {year}", "papers": [], "authors": []}
-    if year == 2022:
-        res = requests.get("https://preview.aclanthology.org/emnlp-22-ingestion/volumes/2022.emnlp-main/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        papers = soup.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-                
-    elif year >= 2020:
-        res = requests.get(f"https://aclanthology.org/events/emnlp-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        div = soup.find_all("div", {"id": f"{year}emnlp-main"})[0]
-        papers = div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-    
-    elif year >= 2018:
-        res = requests.get(f"https://aclanthology.org/events/emnlp-{year}/")
-        soup = BeautifulSoup(res.text, "html.parser")
-        div = soup.find_all("div", {"id": f"d{str(year)[2:]}-1"})[0]
-        papers = div.find_all("span", {"class": "d-block"})
-        for paper in tqdm(papers):
-            a_list = paper.find_all("a")
-            title = a_list[0].text
-            for keyword in keywords:
-                if keyword.lower() in title.lower():
-                    authors = a_list[1:]
-                    authors = [a.text for a in authors]
-                    parsed["papers"].append(title)
-                    parsed["authors"].append(authors)
-                    break
-    
-    else:
-        raise
-    
-    return parsed
+DEDUP_HELP = "write each paper once, listing every venue/track it appeared in (titles matched after normalization and by near-duplicate detection)"
 
-conference = {
-    "eccv"    : get_eccv,
-    "neurips" : get_neurips,
-    "iclr" : get_iclr,
-    "cvpr" : get_cvpr,
-    "iccv" : get_iccv,
-    "icml" : get_icml,
-    "acl" : get_acl,
-    "emnlp" : get_emnlp,
-}
+# An empty keyword is a substring of every title, so getters called with it
+# return the full paper list.
+ALL_PAPERS = [""]
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("-c", "--conference", required=True, type=str, nargs="+")
-    parser.add_argument("-y", "--year", required=True, type=str, nargs="+") # 
-    parser.add_argument("-k", "--keywords", required=True, type=str, nargs="+")
+    command = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in ["crawl", "query", "authors"] else None
+    if command is not None:
+        subparsers = parser.add_subparsers(dest="command")
+        crawl_parser = subparsers.add_parser("crawl", help="store every paper of the given venues in the local corpus")
+        query_parser = subparsers.add_parser("query", help="filter the local corpus by keywords")
+        for sub in [crawl_parser, query_parser]:
+            sub.add_argument("-c", "--conference", required=True, type=str, nargs="+")
+            sub.add_argument("-y", "--year", required=True, type=str, nargs="+")
+            sub.add_argument("--db", default="papers.sqlite", type=str, help="path of the local corpus")
+            add_report_arguments(sub)
+        add_fetch_arguments(crawl_parser)
+        crawl_parser.add_argument("--incremental", action="store_true", help="skip finalized venues and write only newly added papers")
+        crawl_parser.add_argument("-f", "--format", default="xlsx", choices=list(writers.keys()), help="output format of the new papers")
+        query_parser.add_argument("-f", "--format", default="xlsx", choices=list(writers.keys()), help="output format")
+        query_parser.add_argument("--dedup", action="store_true", help=DEDUP_HELP)
+        add_match_arguments(query_parser)
+        match_group = query_parser.add_mutually_exclusive_group(required=True)
+        match_group.add_argument("-k", "--keywords", type=str, nargs="+")
+        match_group.add_argument("-q", "--query", type=str, help='boolean title search, e.g. \'"neural radiance" AND (nerf OR gaussian) NOT survey\'')
+        match_group.add_argument("--semantic", type=str, metavar="TEXT", help="rank titles by similarity to TEXT (requires numpy)")
+        query_parser.add_argument("--limit", default=50, type=int, help="with --semantic, number of titles written, best first")
+        add_batch_arguments(query_parser, match_group)
+        authors_parser = subparsers.add_parser("authors", help="search the local corpus by author")
+        authors_parser.add_argument("-c", "--conference", default=None, type=str, nargs="+", help="limit to these venues (default: all)")
+        authors_parser.add_argument("-y", "--year", default=None, type=str, nargs="+", help="limit to these years (default: all)")
+        authors_parser.add_argument("--db", default="papers.sqlite", type=str, help="path of the local corpus")
+        author_group = authors_parser.add_mutually_exclusive_group(required=True)
+        author_group.add_argument("--by", type=str, metavar="NAME", help="all papers by NAME")
+        author_group.add_argument("--top", type=str, nargs="+", metavar="KEYWORD", help="authors with the most papers matching any KEYWORD")
+        author_group.add_argument("--coauthors", type=str, metavar="NAME", help="co-authors of NAME")
+        authors_parser.add_argument("--depth", default=1, type=int, help="with --coauthors, hops from NAME (2 adds co-authors of co-authors)")
+        authors_parser.add_argument("--limit", default=20, type=int, help="maximum number of authors listed")
+    else:
+        parser.add_argument("-c", "--conference", required=True, type=str, nargs="+")
+        parser.add_argument("-y", "--year", required=True, type=str, nargs="+") # 
+        match_group = parser.add_mutually_exclusive_group(required=True)
+        match_group.add_argument("-k", "--keywords", type=str, nargs="+")
+        add_batch_arguments(parser, match_group)
+        parser.add_argument("-f", "--format", default="xlsx", choices=list(writers.keys()), help="output format")
+        parser.add_argument("--dedup", action="store_true", help=DEDUP_HELP)
+        add_match_arguments(parser)
+        add_fetch_arguments(parser)
+        add_report_arguments(parser)
 
     args = parser.parse_args()
+    if command == "authors":
+        index = Corpus(args.db).authors(process_conferences(args.conference) if args.conference else None,
+                                        process_years(args.year) if args.year else None)
+        print_authors(index, args)
+        sys.exit(0)
+    if args.profile:
+        stats.enable_profiling()
+    atexit.register(stats.finish, args.report, args.profile)
 
     # Process arguments
     conferences = process_conferences(args.conference)
     years = process_years(args.year)
-
-    parseds = []
-    for conf in conferences:
-        print(f"Start {conf}")
-        for year in years:
-            # try:
-            parsed = conference[conf](year, args.keywords)
-            if parsed is not None:
-                parseds.append(parsed)
-            # except:
-            #     print(f"{conf} {year} failed")
-            #     pass
-
-    wb = openpyxl.Workbook()
-    offset = 1
-    for parsed in parseds:
-        if isinstance(parsed, tuple):
-            if len(parsed) == 2:
-                sheet = wb.worksheets[0]
-                for session in range(len(parsed)):
-                    for row, (paper, author) in enumerate(zip(parsed[session]["papers"], parsed[session]["authors"]), offset):
-                        sheet.cell(row=row, column=1).value = parsed[session]["conference"]
-                        sheet.cell(row=row, column=2).value = paper
-                        sheet.cell(row=row, column=3).value = author[0]
-                    offset += len(parsed[session]["papers"])
-            elif len(parsed) == 3: # poster, spotlight, oral
-                sheet = wb.worksheets[0]
-                for session in range(len(parsed)):
-                    for row, (paper, author) in enumerate(zip(parsed[session]["papers"], parsed[session]["authors"]), offset):
-                        sheet.cell(row=row, column=1).value = parsed[session]["conference"]
-                        sheet.cell(row=row, column=2).value = paper
-                        sheet.cell(row=row, column=3).value = author[0]
-                    offset += len(parsed[session]["papers"])
-        else:
-            sheet = wb.worksheets[0]
-            for row, (paper, author) in enumerate(zip(parsed["papers"], parsed["authors"]), offset):
-                sheet.cell(row=row, column=1).value = parsed["conference"]
-                sheet.cell(row=row, column=2).value = paper
-                sheet.cell(row=row, column=3).value = author[0]
-            offset += len(parsed["papers"])
-
-    if not len(conferences) == len(list(conference.keys())):
-        upper_conference = "_".join([upper_title(c) for c in conferences])
+    jobs = [(conf, year) for conf in conferences for year in years]
+
+    if command == "crawl":
+        configure_fetch(args, parser)
+        corpus = Corpus(args.db)
+        writer = None
+        if args.incremental:
+            for conf, year in jobs:
+                if corpus.is_final(conf, year):
+                    print(f"{conf} {year}: final, skipped")
+            jobs = [(conf, year) for conf, year in jobs if not corpus.is_final(conf, year)]
+            # A new file per run, so an earlier delta is never overwritten.
+            name, extension = os.path.splitext(output_name(conferences, years, ["new"], args.format))
+            writer = writers[args.format](f"{name}_{time.strftime('%Y%m%d-%H%M%S')}{extension}")
+        # With --incremental nothing is committed until the delta file is
+        # saved: if the run fails, its new papers are still new next time.
+        try:
+            for conf, year, results in run_jobs(jobs, conference, KeywordMatcher(ALL_PAPERS), args.workers):
+                if results is not None:
+                    delta = corpus.store(conf, year, results, commit=writer is None)
+                    print(f"{conf} {year}: {corpus.count(conf, year)} papers, {len(delta)} new")
+                    if writer is not None:
+                        with stats.job(conf, year), stats.export(len(delta)):
+                            writer.write(delta)
+        finally:
+            if writer is not None:
+                with stats.export(0):
+                    writer.close()
+        corpus.commit()
     else:
-        upper_conference = 'ALL'
-
-    years = "_".join([str(y) for y in years])
-    keywords = [k.lower() for k in args.keywords]
-    keywords = "_".join(sorted(keywords))
-
-    save_path = f"{upper_conference}_{years}_{keywords}.xlsx"
-    wb.save(save_path)
+        if command == "query" and args.query is not None:
+            try:
+                fts_query(args.query)
+            except ValueError as e:
+                parser.error(f"-q: {e}")
+            # Labels (and the file name) are the terms titles must contain.
+            args.keywords = positive_terms(args.query)
+        if command == "query" and args.semantic is not None:
+            args.keywords = re.findall(r"\w+", args.semantic)
+            if args.limit < 1:
+                parser.error("--limit must be at least 1")
+        if command == "query" and (args.query is not None or args.semantic is not None) and args.match != "substring":
+            parser.error("--match applies to -k and --batch only")
+        if args.sheets and (args.batch is None or args.format != "xlsx"):
+            parser.error("--sheets requires --batch and --format xlsx")
+        if args.batch is not None:
+            # Crawl (or query) once with the union of every query's keywords.
+            try:
+                queries = batch.read_queries(args.batch)
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            args.keywords = batch.keywords(queries)
+            writer = batch_writer(args, conferences, years, queries)
+        else:
+            writer = writers[args.format](output_name(conferences, years, args.keywords, args.format))
+            if args.dedup:
+                writer = DedupWriter(writer)
+        # Whatever was written is saved, even if a job or query fails.
+        try:
+            if command == "query":
+                corpus = Corpus(args.db)
+                matcher = new_matcher(args.keywords, args.match)
+                for conf, year in jobs:
+                    if not corpus.count(conf, year):
+                        print(f"{conf} {year} is not in {args.db}, run crawl first")
+                    if args.semantic is not None:
+                        continue
+                    if args.match == "substring":
+                        try:
+                            results = corpus.query(conf, year, args.keywords if args.query is None else [], args.query).match(matcher)
+                        except (ValueError, sqlite3.OperationalError) as e:
+                            parser.error(f"-q: {e}")
+                    else:
+                        # The title index finds substrings only, so every title
+                        # of the venue is matched here instead.
+                        results = corpus.query(conf, year).match(matcher, keep_unmatched=False)
+                    with stats.job(conf, year), stats.export(len(results)):
+                        writer.write(results)
+                if args.semantic is not None:
+                    try:
+                        from semantic import SemanticIndex
+                    except ImportError:
+                        raise SystemExit("--semantic requires numpy (pip install numpy)")
+                    results = SemanticIndex(corpus, args.db).search(args.semantic, jobs, args.limit)
+                    with stats.export(len(results)):
+                        writer.write(results)
+            else:
+                configure_fetch(args, parser)
+                for conf, year, results in run_jobs(jobs, conference, new_matcher(args.keywords, args.match), args.workers):
+                    if results is not None:
+                        with stats.job(conf, year), stats.export(len(results)):
+                            writer.write(results)
+        finally:
+            with stats.export(0):
+                writer.close()
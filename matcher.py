@@ -0,0 +1,244 @@
+import functools
+import re
+import unicodedata
+
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Below this many keywords one `in` test per keyword (a C substring search)
+# beats walking the pure-Python automaton character by character (measured
+# crossover: about 40 keywords on 24k titles).
+AUTOMATON_MIN = 40
+
+class KeywordMatcher:
+    # Case-insensitive substring matching of all keywords. With pyahocorasick
+    # installed, its C automaton scans each title once; otherwise short lists
+    # test each keyword with `in`, and long lists use a pure-Python
+    # Aho-Corasick automaton, whose cost per title does not grow with the
+    # number of keywords.
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.patterns: List[Tuple[str, int]] = []
+        self.match_empty = 0
+        for i, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if pattern:
+                self.patterns.append((pattern, 1 << i))
+            else:
+                self.match_empty |= 1 << i
+        self.native = None
+        self.goto: Optional[List[Dict[str, int]]] = None
+        try:
+            import ahocorasick
+        except ImportError:
+            ahocorasick = None
+        if ahocorasick is not None and self.patterns:
+            bits: Dict[str, int] = {}
+            for pattern, bit in self.patterns:
+                bits[pattern] = bits.get(pattern, 0) | bit
+            self.native = ahocorasick.Automaton()
+            for pattern, bit in bits.items():
+                self.native.add_word(pattern, bit)
+            self.native.make_automaton()
+        elif len(self.patterns) >= AUTOMATON_MIN:
+            self.build()
+
+    def build(self) -> None:
+        self.goto = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[int] = [0]
+        for pattern, bit in self.patterns:
+            state = 0
+            for ch in pattern:
+                if ch not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(0)
+                    self.goto[state][ch] = len(self.goto) - 1
+                state = self.goto[state][ch]
+            self.output[state] |= bit
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def mask(self, text: str) -> int:
+        found = self.match_empty
+        lowered = text.lower()
+        if self.native is not None:
+            for _, bits in self.native.iter(lowered):
+                found |= bits
+        elif self.goto is not None:
+            goto, fail, output = self.goto, self.fail, self.output
+            state = 0
+            for ch in lowered:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                found |= output[state]
+        else:
+            for pattern, bit in self.patterns:
+                if pattern in lowered:
+                    found |= bit
+        return found
+
+    def match(self, text: str) -> List[str]:
+        # Matched keywords, in the order they were given on the command line.
+        found = self.mask(text)
+        return [keyword for i, keyword in enumerate(self.keywords) if found >> i & 1]
+
+# --match stem / fuzzy: keywords and titles are compared word by word, after
+# folding case and accents and reducing each word to a stem, so "transformers",
+# "Transformer-based" and "TRANSFORMER" all contain the keyword "transformer".
+# A multi-word keyword must appear as consecutive words. With fuzzy matching a
+# word may also be a few typos away from a keyword's word.
+
+def words(text: str) -> List[str]:
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"\w+", text.casefold())
+
+@functools.lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    # A light suffix stripper (plurals, -ing, -ed, final e). It only has to
+    # map the forms of a word to the same stem, not to a real word.
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "xes", "ches", "shes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in "sz":
+                word = word[:-1]
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+def allowed_edits(word: str) -> int:
+    # Typos tolerated in a keyword's word: none in short words, where one
+    # edit gives another common word ("gan", "can").
+    return 0 if len(word) <= 4 else 1 if len(word) <= 8 else 2
+
+def deletions(word: str, edits: int) -> Set[str]:
+    found = {word}
+    layer = {word}
+    for _ in range(edits):
+        layer = {w[:i] + w[i + 1:] for w in layer for i in range(len(w))}
+        found |= layer
+    return found
+
+def distance(a: str, b: str, bound: int) -> int:
+    # Edit distance counting a swap of neighbouring letters as one edit, or
+    # bound + 1 as soon as it is known to exceed `bound`.
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > bound:
+            return bound + 1
+        before, previous = previous, current
+    return previous[-1]
+
+class TokenMatcher:
+    # Same interface as KeywordMatcher. Every distinct title word is looked
+    # up once and remembered, so a title costs one dictionary lookup per
+    # word however many keywords are given or whether fuzzy matching is on.
+    # Fuzzy lookups use a deletion index (every keyword word with up to
+    # allowed_edits letters removed): a title word only needs its own
+    # deletions looked up, never a comparison against every keyword.
+    def __init__(self,
+                 keywords : List[str],
+                 fuzzy    : bool = False
+                 ):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.fuzzy = fuzzy
+        self.stems: List[str] = []
+        ids: Dict[str, int] = {}
+        self.phrases: List[List[int]] = []
+        self.starts: Dict[int, List[int]] = {}
+        self.match_empty = 0
+        for i, keyword in enumerate(self.keywords):
+            phrase = []
+            for word in words(keyword):
+                word = stem(word)
+                if word not in ids:
+                    ids[word] = len(self.stems)
+                    self.stems.append(word)
+                phrase.append(ids[word])
+            self.phrases.append(phrase)
+            if phrase:
+                self.starts.setdefault(phrase[0], []).append(i)
+            elif not keyword:
+                self.match_empty |= 1 << i
+        self.ids = ids
+        self.index: Dict[str, List[int]] = {}
+        self.edits = 0
+        if fuzzy:
+            for word, id in ids.items():
+                for deleted in deletions(word, allowed_edits(word)):
+                    self.index.setdefault(deleted, []).append(id)
+            self.edits = max(map(allowed_edits, self.stems), default=0)
+        self.seen: Dict[str, FrozenSet[int]] = {}
+
+    def lookup(self, word: str) -> FrozenSet[int]:
+        # Ids of the keyword words that `word` (a title word) matches.
+        found = self.seen.get(word)
+        if found is None:
+            word_stem = stem(word)
+            found = {self.ids[word_stem]} if word_stem in self.ids else set()
+            if self.fuzzy:
+                for deleted in deletions(word_stem, self.edits):
+                    for id in self.index.get(deleted, ()):
+                        if id not in found:
+                            keyword_stem = self.stems[id]
+                            bound = allowed_edits(keyword_stem)
+                            if distance(word_stem, keyword_stem, bound) <= bound:
+                                found.add(id)
+            found = self.seen[word] = frozenset(found)
+        return found
+
+    def mask(self, text: str) -> int:
+        found = self.match_empty
+        matches = [self.lookup(word) for word in words(text)]
+        for position, ids in enumerate(matches):
+            for id in ids:
+                for i in self.starts.get(id, ()):
+                    phrase = self.phrases[i]
+                    if len(phrase) == 1 or (position + len(phrase) <= len(matches)
+                                            and all(phrase[k] in matches[position + k] for k in range(1, len(phrase)))):
+                        found |= 1 << i
+        return found
+
+    def match(self, text: str) -> List[str]:
+        found = self.mask(text)
+        return [keyword for i, keyword in enumerate(self.keywords) if found >> i & 1]
+
+def new_matcher(keywords : List[str],
+                mode     : str = "substring"
+                ):
+    # mode is one of MATCH_MODES.
+    if mode == "substring":
+        return KeywordMatcher(keywords)
+    return TokenMatcher(keywords, fuzzy=mode == "fuzzy")
+
+MATCH_MODES = ["substring", "stem", "fuzzy"]
@@ -0,0 +1,47 @@
+import os
+import time
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+import stats
+from extract import DEFAULT_BACKEND
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    import requests
+
+# Parsing is CPU-bound, so extractors run in a process pool when one is
+# configured. Only the raw response bytes go in and compact tuples come back.
+_pool: Optional["ProcessPoolExecutor"] = None
+backend = DEFAULT_BACKEND
+
+def set_backend(name: str) -> None:
+    global backend
+    backend = DEFAULT_BACKEND if name == "auto" else name
+
+def set_workers(workers: Optional[int]) -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    if workers is None:
+        # A single process gains nothing from a pool.
+        workers = os.cpu_count() or 1
+        workers = workers if workers > 1 else 0
+    if workers > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        _pool = ProcessPoolExecutor(max_workers=workers)
+
+def extract(extractor   : Callable,
+            res         : "requests.Response",
+            **kwargs
+            ) -> list:
+    start = time.perf_counter()
+    if _pool is None:
+        papers = extractor(res.content, res.encoding, backend, **kwargs)
+    else:
+        papers = _pool.submit(extractor, res.content, res.encoding, backend, **kwargs).result()
+    # Measured in the calling thread, so this includes waiting for the pool.
+    stats.record_parse(extractor.__name__, res.url, time.perf_counter() - start, len(papers))
+    return papers
@@ -0,0 +1,109 @@
+import sys
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+Row = Tuple[str, str, List[str], List[str]]
+
+class Strings:
+    # Each distinct string once, numbered in first-seen order. Strings are
+    # also sys.intern'ed, so an author appearing in many results is one
+    # object in memory.
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+class Results:
+    # The papers of one (conference, year) job, for every track, in columns:
+    # paper i is titles[i] in tracks[track_codes[i]], its authors are
+    # author_codes[author_ends[i - 1]:author_ends[i]] in the `authors` table,
+    # its matched keywords likewise. Tracks with no papers are kept, since
+    # the corpus manifest records them too.
+    __slots__ = ("tracks", "sources", "track_codes", "titles", "authors", "author_ends", "author_codes",
+                 "keywords", "keyword_ends", "keyword_codes")
+
+    def __init__(self):
+        self.tracks: List[str] = []
+        self.sources: List[Optional[str]] = []
+        self.track_codes = array("H")
+        self.titles: List[str] = []
+        self.authors = Strings()
+        self.author_ends = array("I")
+        self.author_codes = array("I")
+        self.keywords = Strings()
+        self.keyword_ends = array("I")
+        self.keyword_codes = array("H")
+
+    def add_track(self, label: str, source: Optional[str] = None) -> int:
+        self.tracks.append(label)
+        self.sources.append(source)
+        return len(self.tracks) - 1
+
+    def like(self) -> "Results":
+        # Same tracks, no papers.
+        other = Results()
+        other.tracks = list(self.tracks)
+        other.sources = list(self.sources)
+        return other
+
+    def append(self,
+               track    : int,
+               title    : str,
+               authors  : Iterable[str],
+               keywords : Iterable[str] = ()
+               ) -> None:
+        self.track_codes.append(track)
+        self.titles.append(title)
+        self.author_codes.extend(self.authors.code(name) for name in authors)
+        self.author_ends.append(len(self.author_codes))
+        self.keyword_codes.extend(self.keywords.code(keyword) for keyword in keywords)
+        self.keyword_ends.append(len(self.keyword_codes))
+
+    def match(self,
+              matcher,
+              keep_unmatched : bool = True
+              ) -> "Results":
+        # A copy with every paper's keywords replaced by what `matcher` finds
+        # in its title, e.g. for papers read back from the corpus. Papers
+        # with no match are left out unless `keep_unmatched`.
+        other = self.like()
+        for i, title in enumerate(self.titles):
+            keywords = matcher.match(title)
+            if keywords or keep_unmatched:
+                other.append(self.track_codes[i], title, self.authors_of(i), keywords)
+        return other
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def authors_of(self, i: int) -> List[str]:
+        start = self.author_ends[i - 1] if i else 0
+        return list(map(self.authors.values.__getitem__, self.author_codes[start:self.author_ends[i]]))
+
+    def keywords_of(self, i: int) -> List[str]:
+        start = self.keyword_ends[i - 1] if i else 0
+        return list(map(self.keywords.values.__getitem__, self.keyword_codes[start:self.keyword_ends[i]]))
+
+    def in_track(self, track: int) -> List[int]:
+        return [i for i, code in enumerate(self.track_codes) if code == track]
+
+    def __iter__(self) -> Iterator[Row]:
+        # (track, title, authors, matched keywords) per paper. The code
+        # columns are resolved in one pass up front (references to the
+        # interned strings, not copies), then sliced per paper.
+        tracks = self.tracks
+        authors = list(map(self.authors.values.__getitem__, self.author_codes))
+        keywords = list(map(self.keywords.values.__getitem__, self.keyword_codes))
+        author_start = keyword_start = 0
+        for track, title, author_end, keyword_end in zip(self.track_codes, self.titles, self.author_ends, self.keyword_ends):
+            yield tracks[track], title, authors[author_start:author_end], keywords[keyword_start:keyword_end]
+            author_start, keyword_start = author_end, keyword_end
@@ -0,0 +1,27 @@
+import sys
+
+from typing import Iterator, List, Tuple
+
+import stats
+from matcher import KeywordMatcher
+
+def run_jobs(jobs       : List[Tuple[str, int]],
+             getters    : dict,
+             matcher    : KeywordMatcher,
+             workers    : int = 4,
+             ) -> Iterator[Tuple[str, int, object]]:
+    # Jobs run concurrently, but results are yielded in submission order so
+    # that the merged output is identical to a serial run. Each job runs under
+    # its own stats.job so fetches and parses are attributed to it. A job that
+    # fails (e.g. an HTTP error) is reported and yields None, so the other
+    # jobs' results are still written.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [(conf, year, executor.submit(stats.in_job, conf, year, getters[conf], year, matcher)) for conf, year in jobs]
+        for conf, year, future in futures:
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"{conf} {year} failed, skipped: {type(e).__name__}: {e}", file=sys.stderr)
+                results = None
+            yield conf, year, results
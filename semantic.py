@@ -0,0 +1,238 @@
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from corpus import Corpus
+from matcher import stem, words
+from results import Results
+
+# query --semantic: every stored title ranked by similarity to a free-text
+# query, with latent semantic analysis. A model (IDF weights of the corpus's
+# terms and an SVD basis of its TF-IDF matrix) is fitted once per corpus, and
+# each (conference, year) gets a matrix of its titles' unit vectors, saved as
+# .npy next to the corpus and memory-mapped by later queries. A query is then
+# one matrix-vector product per venue and a partial sort.
+
+DIMENSIONS = 128     # latent dimensions of the title vectors
+MAX_TERMS = 1 << 17  # most frequent terms kept by the model
+FIT_TITLES = 50000   # titles sampled to fit the model
+REFIT = 2            # refit once the corpus is this many times larger
+CHUNK = 1 << 22      # floats per block in sparse products
+
+STOPWORDS = frozenset("a an and are as at by can do for from how in into is it its of on or "
+                      "our over the their this to toward towards under via we what when with without".split())
+
+Sparse = Tuple[np.ndarray, np.ndarray, np.ndarray, int]
+
+def terms(title: str) -> List[str]:
+    # Stems of the title's words, without stopwords, and pairs of neighbouring
+    # stems ("neural radianc"), which carry much of what a title is about.
+    stems = [stem(word) for word in words(title) if word not in STOPWORDS]
+    return stems + [f"{a} {b}" for a, b in zip(stems, stems[1:])]
+
+def tfidf(titles     : List[str],
+          vocabulary : Dict[str, int],
+          idf        : np.ndarray
+          ) -> Sparse:
+    # (rows, columns, values, number of rows) of the titles' TF-IDF vectors,
+    # sorted by row, each row of unit length. Unknown terms are dropped.
+    rows: List[int] = []
+    columns: List[int] = []
+    counts: List[int] = []
+    for i, title in enumerate(titles):
+        found: Dict[int, int] = {}
+        for term in terms(title):
+            column = vocabulary.get(term)
+            if column is not None:
+                found[column] = found.get(column, 0) + 1
+        rows += [i] * len(found)
+        columns += found
+        counts += found.values()
+    rows_ = np.array(rows, dtype=np.int64)
+    columns_ = np.array(columns, dtype=np.int64)
+    values = ((1 + np.log(np.array(counts, dtype=np.float32))) * idf[columns_]).astype(np.float32)
+    norms = np.sqrt(np.bincount(rows_, values * values, minlength=len(titles))).astype(np.float32)
+    values /= norms[rows_]
+    return rows_, columns_, values, len(titles)
+
+def transpose(matrix: Sparse, columns: int) -> Sparse:
+    rows, cols, values, _ = matrix
+    order = np.argsort(cols, kind="stable")
+    return cols[order], rows[order], values[order], columns
+
+def product(matrix: Sparse, dense: np.ndarray) -> np.ndarray:
+    # Sparse matrix times dense matrix, a block of whole rows at a time: each
+    # nonzero scales a row of `dense`, and each row's products are summed.
+    rows, cols, values, n = matrix
+    out = np.zeros((n, dense.shape[1]), dtype=np.float32)
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]]) if len(rows) else np.zeros(0, dtype=np.int64)
+    step = max(1, CHUNK // max(1, dense.shape[1]))
+    i = 0
+    while i < len(starts):
+        j = max(i + 1, int(np.searchsorted(starts, starts[i] + step)))
+        low = starts[i]
+        high = starts[j] if j < len(starts) else len(rows)
+        block = values[low:high, None] * dense[cols[low:high]]
+        out[rows[starts[i:j]]] = np.add.reduceat(block, starts[i:j] - low)
+        i = j
+    return out
+
+def orthonormal(vectors: np.ndarray) -> np.ndarray:
+    # An orthonormal basis of the columns of a tall matrix, from the small
+    # Gram matrix (much faster than a QR of the whole matrix).
+    values, basis = np.linalg.eigh(vectors.T.astype(np.float64) @ vectors)
+    keep = values > values.max() * 1e-10
+    return (vectors @ (basis[:, keep] / np.sqrt(values[keep]))).astype(np.float32)
+
+def normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+class Model:
+    # Terms with their IDF weights, and the basis titles are projected on.
+    def __init__(self,
+                 terms      : List[str],
+                 idf        : np.ndarray,
+                 components : np.ndarray,
+                 titles     : int
+                 ):
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.components = components
+        self.titles = titles
+        self.id = hashlib.sha256(components.tobytes()).hexdigest()[:16]
+
+    @classmethod
+    def fit(cls, titles: List[str], total: int) -> "Model":
+        # Randomized SVD of the TF-IDF matrix (a few products with a random
+        # basis and one power iteration, then an exact SVD of a small
+        # matrix). `total` is the size of the corpus `titles` were sampled
+        # from.
+        df = Counter(term for title in titles for term in set(terms(title)))
+        kept = [term for term, n in df.most_common(MAX_TERMS) if n >= 2] or list(df)
+        idf = np.array([math.log((1 + len(titles)) / (1 + df[term])) + 1 for term in kept], dtype=np.float32)
+        vocabulary = {term: i for i, term in enumerate(kept)}
+        matrix = tfidf(titles, vocabulary, idf)
+        if not len(matrix[2]):
+            return cls(kept, idf, np.zeros((len(kept), 0), dtype=np.float32), total)
+        rank = min(DIMENSIONS + 10, len(titles), len(kept))
+        by_column = transpose(matrix, len(kept))
+        basis = np.random.default_rng(0).standard_normal((len(kept), rank)).astype(np.float32)
+        sample = orthonormal(product(matrix, basis))
+        sample = orthonormal(product(matrix, orthonormal(product(by_column, sample))))
+        _, _, vt = np.linalg.svd(product(by_column, sample).T, full_matrices=False)
+        return cls(kept, idf, np.ascontiguousarray(vt[:DIMENSIONS].T, dtype=np.float32), total)
+
+    @classmethod
+    def load(cls, path: str) -> "Model":
+        with np.load(path) as saved:
+            return cls(saved["terms"].tolist(), saved["idf"], saved["components"], int(saved["titles"]))
+
+    def save(self, path: str) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(path, "wb") as f:
+            np.savez(f, terms=np.array(terms, dtype=str), idf=self.idf, components=self.components, titles=self.titles)
+
+    def embed(self, titles: List[str]) -> np.ndarray:
+        # Unit vectors, one row per title (all zeros if it has no known term).
+        return normalized(product(tfidf(titles, self.vocabulary, self.idf), self.components))
+
+class SemanticIndex:
+    # The model and per-venue title vectors of the corpus at `path`, kept in
+    # `{corpus name}.vectors/`. Vectors are (re)computed when a venue is
+    # first searched or was crawled again since; the model is refitted, and
+    # every venue's vectors with it, when the corpus has grown REFIT times.
+    def __init__(self, corpus: Corpus, path: str):
+        self.corpus = corpus
+        self.directory = os.path.splitext(path)[0] + ".vectors"
+        os.makedirs(self.directory, exist_ok=True)
+        self.state_path = os.path.join(self.directory, "index.json")
+        self.state = {"model": None, "venues": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                self.state = json.load(f)
+        self.model = self.load_model()
+
+    def save_state(self) -> None:
+        with open(self.state_path + ".tmp", "w") as f:
+            json.dump(self.state, f)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def load_model(self) -> Model:
+        path = os.path.join(self.directory, "model.npz")
+        total = self.corpus.db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        if os.path.exists(path):
+            model = Model.load(path)
+            if model.id == self.state["model"] and total <= REFIT * model.titles:
+                return model
+        titles = [title for title, in self.corpus.db.execute("SELECT title FROM papers ORDER BY id")]
+        if len(titles) > FIT_TITLES:
+            chosen = np.sort(np.random.default_rng(0).choice(len(titles), FIT_TITLES, replace=False))
+            titles = [titles[i] for i in chosen]
+        model = Model.fit(titles, total)
+        model.save(path)
+        self.state = {"model": model.id, "venues": {}}
+        self.save_state()
+        return model
+
+    def vectors(self,
+                conference : str,
+                year       : int
+                ) -> Tuple[np.ndarray, np.ndarray]:
+        # (paper ids, memory-mapped matrix of their title vectors).
+        name = f"{conference}_{year}"
+        ids_path = os.path.join(self.directory, f"{name}.ids.npy")
+        matrix_path = os.path.join(self.directory, f"{name}.npy")
+        # The manifest's content hashes change whenever store() rewrites the
+        # venue's papers.
+        manifest = self.corpus.db.execute("SELECT track, content_hash FROM manifest WHERE conference = ? AND year = ? ORDER BY track",
+                                          (conference, year)).fetchall()
+        fingerprint = hashlib.sha256(json.dumps(manifest).encode()).hexdigest()
+        if self.state["venues"].get(name) != fingerprint or not (os.path.exists(ids_path) and os.path.exists(matrix_path)):
+            rows = self.corpus.db.execute("SELECT id, title FROM papers WHERE conference = ? AND year = ? ORDER BY id",
+                                          (conference, year)).fetchall()
+            np.save(ids_path, np.array([id for id, _ in rows], dtype=np.int64))
+            np.save(matrix_path, self.model.embed([title for _, title in rows]))
+            self.state["venues"][name] = fingerprint
+            self.save_state()
+        return np.load(ids_path), np.load(matrix_path, mmap_mode="r")
+
+    def search(self,
+               text  : str,
+               jobs  : List[Tuple[str, int]],
+               limit : int = 50
+               ) -> Results:
+        # The `limit` titles of the (conference, year) jobs most similar to
+        # `text`, best first. The keywords column has no keywords to show
+        # here, so it labels each title with its cosine similarity instead.
+        query = self.model.embed([text])[0]
+        found: List[Tuple[float, int]] = []
+        if query.any():
+            for conference, year in jobs:
+                ids, matrix = self.vectors(conference, year)
+                if not len(ids):
+                    continue
+                scores = matrix @ query
+                top = np.argpartition(-scores, min(limit, len(ids)) - 1)[:limit]
+                found += zip(scores[top].tolist(), ids[top].tolist())
+        found = sorted(found, key=lambda hit: -hit[0])[:limit]
+
+        papers = {}
+        for start in range(0, len(found), 500):
+            chunk = [id for _, id in found[start:start + 500]]
+            rows = self.corpus.db.execute(f"SELECT id, track, title, authors FROM papers WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            papers.update((id, (track, title, json.loads(authors))) for id, track, title, authors in rows)
+        results = Results()
+        codes: Dict[str, int] = {}
+        for score, id in found:
+            track, title, authors = papers[id]
+            if track not in codes:
+                codes[track] = results.add_track(track)
+            results.append(codes[track], title, authors, [f"similarity {score:.3f}"])
+        return results
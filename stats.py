@@ -0,0 +1,224 @@
+import contextlib
+import contextvars
+import json
+import sys
+import threading
+import time
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Run instrumentation. Fetches, parses, keyword matching and exports are
+# recorded with the (conference, year) job they belong to, then written as a
+# JSON report and/or summarized as a table (see --report).
+#
+# The job is a context variable: scheduler.run_jobs sets it per job and
+# fetch.get_many copies it into its threads.
+
+current_job: contextvars.ContextVar[Optional[Tuple[str, int]]] = contextvars.ContextVar("current_job", default=None)
+
+_lock = threading.Lock()
+started = time.time()
+fetches: List[Dict] = []
+parses: List[Dict] = []
+tracks: List[Dict] = []
+exports: List[Dict] = []
+
+# --profile: "pyinstrument" or "cprofile" once enabled. Profilers only see
+# their own thread, so every job gets one and they are merged at the end.
+# Since Python 3.12 cProfile is built on sys.monitoring, which is
+# process-wide: the main thread's profile sees every thread, and enabling a
+# second one raises, so jobs do not start their own.
+SHARED_CPROFILE = sys.version_info >= (3, 12)
+profiler: Optional[str] = None
+profiles: List = []
+main_profile = None
+
+def record(events: List[Dict], **fields) -> Dict:
+    job = current_job.get()
+    event = {"conference": job[0] if job else None, "year": job[1] if job else None, **fields}
+    with _lock:
+        events.append(event)
+    return event
+
+def record_fetch(url: str, seconds: float, size: Optional[int], cached: bool, status: int) -> Dict:
+    # `size` is None for streamed bodies until add_bytes is called.
+    return record(fetches, url=url, seconds=seconds, bytes=size, cached=cached, status=status)
+
+def add_bytes(event: Optional[Dict], size: int) -> None:
+    if event is not None:
+        with _lock:
+            event["bytes"] = (event["bytes"] or 0) + size
+
+def record_parse(extractor: str, url: str, seconds: float, papers: int) -> None:
+    record(parses, extractor=extractor, url=url, seconds=seconds, papers=papers)
+
+def record_track(track: str, seconds: float, scanned: int, matched: int) -> None:
+    # `seconds` covers reading, parsing and matching the whole track.
+    record(tracks, track=track, seconds=seconds, scanned=scanned, matched=matched)
+
+@contextlib.contextmanager
+def job(conference: str, year: int) -> Iterator[None]:
+    token = current_job.set((conference, year))
+    try:
+        yield
+    finally:
+        current_job.reset(token)
+
+def carry(function: Callable) -> Callable:
+    # Runs `function` under the calling thread's job, e.g. in a pool thread.
+    parent = current_job.get()
+    def run(*args):
+        token = current_job.set(parent)
+        try:
+            return function(*args)
+        finally:
+            current_job.reset(token)
+    return run
+
+def in_job(conference: str, year: int, function: Callable, *args) -> object:
+    with job(conference, year), profiled():
+        return function(*args)
+
+def enable_profiling() -> str:
+    # Also starts profiling the calling (main) thread until finish().
+    global profiler, main_profile
+    try:
+        import pyinstrument
+        profiler = "pyinstrument"
+    except ImportError:
+        profiler = "cprofile"
+    main_profile = start_profile()
+    return profiler
+
+def start_profile() -> object:
+    if profiler is None:
+        return None
+    if profiler == "pyinstrument":
+        import pyinstrument
+        current = pyinstrument.Profiler(async_mode="disabled")
+        current.start()
+    else:
+        if SHARED_CPROFILE and main_profile is not None:
+            return None
+        import cProfile
+        current = cProfile.Profile()
+        try:
+            current.enable()
+        except ValueError as e:
+            # Another profiler or debugger is already attached.
+            print(f"--profile: {e}, not profiling", file=sys.stderr)
+            return None
+    return current
+
+def stop_profile(current: object) -> None:
+    if current is None:
+        return
+    if profiler == "pyinstrument":
+        current.stop()
+    else:
+        current.disable()
+    with _lock:
+        profiles.append(current)
+
+@contextlib.contextmanager
+def profiled() -> Iterator[None]:
+    current = start_profile()
+    try:
+        yield
+    finally:
+        stop_profile(current)
+
+def write_profile(path: str, file=sys.stderr) -> None:
+    # pyinstrument writes an HTML report, cProfile a pstats file (open it
+    # with `python -m pstats` or snakeviz); both print the top of the
+    # profile.
+    if not profiles:
+        return
+    if profiler == "pyinstrument":
+        from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer
+        from pyinstrument.session import Session
+        session = profiles[0].last_session
+        for other in profiles[1:]:
+            session = Session.combine(session, other.last_session)
+        with open(path, "w") as f:
+            f.write(HTMLRenderer().render(session))
+        print(ConsoleRenderer(unicode=False, color=False, short_mode=True).render(session), file=file)
+    else:
+        import pstats
+        merged = pstats.Stats(*profiles, stream=file)
+        merged.dump_stats(path)
+        merged.sort_stats("cumulative").print_stats(25)
+    print(f"profile written to {path}", file=file)
+
+@contextlib.contextmanager
+def export(rows: int) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(exports, seconds=time.perf_counter() - start, rows=rows)
+
+def summary() -> List[Dict]:
+    # One row per (conference, year), unattributed work (e.g. saving the
+    # output file) last, plus a total.
+    rows: Dict[Tuple, Dict] = {}
+    def row(event: Dict) -> Dict:
+        key = (event["conference"], event["year"])
+        if key not in rows:
+            rows[key] = {"conference": key[0], "year": key[1], "requests": 0, "cached": 0, "bytes": 0, "fetch_seconds": 0.0,
+                         "parse_seconds": 0.0, "scanned": 0, "matched": 0, "export_seconds": 0.0}
+        return rows[key]
+
+    with _lock:
+        for event in fetches:
+            r = row(event)
+            r["requests"] += 1
+            r["cached"] += event["cached"]
+            r["bytes"] += event["bytes"] or 0
+            r["fetch_seconds"] += event["seconds"]
+        for event in parses:
+            row(event)["parse_seconds"] += event["seconds"]
+        for event in tracks:
+            r = row(event)
+            r["scanned"] += event["scanned"]
+            r["matched"] += event["matched"]
+        for event in exports:
+            row(event)["export_seconds"] += event["seconds"]
+    result = sorted(rows.values(), key=lambda r: (r["conference"] is None, r["conference"] or "", r["year"] or 0))
+    total = {"conference": "total", "year": None}
+    for name in ["requests", "cached", "bytes", "fetch_seconds", "parse_seconds", "scanned", "matched", "export_seconds"]:
+        total[name] = sum(r[name] for r in result)
+    return result + [total]
+
+def report() -> Dict:
+    with _lock:
+        events = {"fetches": list(fetches), "parses": list(parses), "tracks": list(tracks), "exports": list(exports)}
+    return {"argv": sys.argv[1:], "started": started, "wall_seconds": time.time() - started, "jobs": summary(), **events}
+
+def write_report(path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=1)
+
+def print_summary(file=sys.stderr) -> None:
+    # Fetch and parse times are summed over concurrent requests, so they can
+    # exceed the wall time.
+    header = f"{'venue':<10} {'year':>4} {'requests':>8} {'cached':>6} {'MB':>8} {'fetch s':>8} {'parse s':>8} {'scanned':>8} {'matched':>8} {'export s':>8}"
+    print(header, file=file)
+    print("-" * len(header), file=file)
+    for r in summary():
+        year = "" if r["year"] is None else r["year"]
+        print(f"{str(r['conference'] or '-'):<10} {year:>4} {r['requests']:>8} {r['cached']:>6} {r['bytes'] / 1e6:>8.2f} {r['fetch_seconds']:>8.2f} "
+              f"{r['parse_seconds']:>8.2f} {r['scanned']:>8} {r['matched']:>8} {r['export_seconds']:>8.2f}", file=file)
+    print(f"wall time {time.time() - started:.2f} s", file=file)
+
+def finish(report_path: Optional[str], profile_path: Optional[str]) -> None:
+    # Registered with atexit by main.py, so partial runs are reported too.
+    global main_profile
+    stop_profile(main_profile)
+    main_profile = None
+    if report_path:
+        write_report(report_path)
+        print_summary()
+        print(f"run report written to {report_path}", file=sys.stderr)
+    if profile_path:
+        write_profile(profile_path)
@@ -0,0 +1,242 @@
+import csv
+import time
+
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import extract
+import fetch
+import parsing
+import stats
+from matcher import KeywordMatcher
+from results import Results
+
+# Every venue is a list of editions (a year range and its tracks). A track
+# declares where its papers come from: the listing URL(s), the scheme used to
+# read them and the scheme's options. One engine (get_papers) runs them all,
+# so a new year is usually one more Edition, not new code.
+#
+# Strings in a track are templates: {year} is the year, {yy} its last two
+# digits.
+
+Paper = Tuple[str, List[str]]
+
+# NamedTuples rather than dataclasses: the registry is built at import time
+# and dataclasses alone add ~15 ms to every start. Options are never mutated
+# (read_html copies them), so the shared empty default is safe.
+class Track(NamedTuple):
+    label   : str
+    source  : str
+    scheme  : str = "html"
+    options : Dict = {}
+
+class Edition(NamedTuple):
+    first   : Optional[int]
+    last    : Optional[int]
+    tracks  : List[Track]
+
+    def covers(self, year: int) -> bool:
+        return (self.first is None or year >= self.first) and (self.last is None or year <= self.last)
+
+def fill(value: object, year: int) -> object:
+    if isinstance(value, str):
+        return value.format(year=year, yy=f"{year % 100:02d}")
+    if isinstance(value, list):
+        return [fill(item, year) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, year) for key, item in value.items()}
+    return value
+
+# Fields kept from each OpenReview note; API v2 wraps every value in {"value": ...}.
+OPENREVIEW_V1 = {"title": "content.title", "authors": "content.authors"}
+OPENREVIEW_V2 = {"title": "content.title.value", "authors": "content.authors.value"}
+# Fields kept from icml.cc's orals-posters.json.
+ICML_FIELDS = {"title": "name", "authors": "authors.fullname", "eventtype": "eventtype"}
+
+def openreview_v1(label: str, venue: str, session: str, limit: int = 1000) -> Track:
+    return Track(label, f"https://api.openreview.net/notes?content.venue={venue}+{{year}}+{session}&details=replyCount&invitation={venue}.cc%2F{{year}}%2FConference%2F-%2FBlind_Submission",
+                 "openreview", {"limit": limit, "fields": OPENREVIEW_V1})
+
+def openreview_v2(label: str, source: str, limit: int) -> Track:
+    return Track(label, source, "openreview", {"limit": limit, "fields": OPENREVIEW_V2})
+
+def cvf_days(venue: str, dates: List[str]) -> Track:
+    # Older CVF proceedings are split into one page per conference day.
+    return Track(f"{venue} {{year}}", f"https://openaccess.thecvf.com/{venue}{{year}}", "html",
+                 {"extractor": "cvf", "pages": [f"https://openaccess.thecvf.com/{venue}{{year}}?day={date}" for date in dates]})
+
+def icml_session(session: str) -> Track:
+    return Track(f"ICML {{year}} {session}", "https://icml.cc/static/virtual/data/icml-{year}-orals-posters.json", "json",
+                 {"key": "results", "fields": ICML_FIELDS, "select": {"eventtype": session}})
+
+def anthology(venue: str, div_ids: Optional[List[str]], source: Optional[str] = None) -> Track:
+    return Track(f"{venue.upper()} {{year}}", source or f"https://aclanthology.org/events/{venue}-{{year}}/", "html",
+                 {"extractor": "anthology", "div_ids": div_ids})
+
+venues: Dict[str, List[Edition]] = {
+    "eccv": [
+        Edition(2024, 2024, [Track("ECCV {year}", "data_eccv2024.csv", "csv", {"separator": "; ", "strip": "*"})]),
+        # ecva.net lists every year on one page; years it does not list (ECCV
+        # is biennial) come back empty.
+        Edition(2018, None, [Track("ECCV {year}", "https://www.ecva.net/papers.php", "index", {"extractor": "ecva"})]),
+    ],
+    "neurips": [
+        Edition(2023, 2024, [openreview_v2(f"NeurIPS {{year}} {name}", f"https://api2.openreview.net/notes?content.venue=NeurIPS%20{{year}}%20{session}&details=replyCount%2Cpresentation&domain=NeurIPS.cc%2F2023%2FConference", limit)
+                             for name, session, limit in [("Oral", "oral", 100), ("Spotlight", "spotlight", 400), ("Poster", "poster", 1000)]]),
+        Edition(2022, 2022, [openreview_v1("NeurIPS {year}", "NeurIPS", "Accept")]),
+        Edition(None, 2021, [Track("NeurIPS {year}", "https://papers.nips.cc/paper/{year}", "html", {"extractor": "nips"})]),
+    ],
+    "iclr": [
+        Edition(2024, 2024, [openreview_v2(f"ICLR {{year}}{name}", f"https://api2.openreview.net/notes?content.venue=ICLR%20{{year}}%20{session}&details=replyCount%2Cpresentation&domain=ICLR.cc%2F{{year}}%2FConference", limit)
+                             for name, session, limit in [(" oral", "oral", 50), (" spotlight", "spotlight", 300), ("", "poster", 1000)]]),
+        Edition(2023, 2023, [openreview_v1("ICLR {year}", "ICLR", "poster"),
+                             openreview_v1("ICLR {year} top 25%", "ICLR", "notable+top+25%25"),
+                             openreview_v1("ICLR {year} top 5%", "ICLR", "notable+top+5%25")]),
+        Edition(None, None, [openreview_v1("ICLR {year}", "ICLR", "Poster"),
+                             openreview_v1("ICLR {year} spotlight", "ICLR", "Spotlight"),
+                             openreview_v1("ICLR {year} oral", "ICLR", "Oral")]),
+    ],
+    "cvpr": [
+        Edition(2024, 2024, [Track("CVPR {year}", "https://cvpr.thecvf.com/Conferences/2024/AcceptedPapers", "html", {"extractor": "cvpr_accepted"})]),
+        Edition(2021, 2023, [Track("CVPR {year}", "https://openaccess.thecvf.com/CVPR{year}?day=all", "html", {"extractor": "cvf"})]),
+        Edition(2020, 2020, [cvf_days("CVPR", ["2020-06-16", "2020-06-17", "2020-06-18"])]),
+        Edition(2019, 2019, [cvf_days("CVPR", ["2019-06-18", "2019-06-19", "2019-06-20"])]),
+        Edition(2018, 2018, [cvf_days("CVPR", ["2018-06-19", "2018-06-20", "2018-06-21"])]),
+        Edition(None, None, [Track("CVPR {year}", "https://openaccess.thecvf.com/CVPR{year}", "html", {"extractor": "cvf"})]),
+    ],
+    "iccv": [
+        Edition(2021, 2023, [Track("ICCV {year}", "https://openaccess.thecvf.com/ICCV{year}?day=all", "html", {"extractor": "cvf"})]),
+        Edition(2019, 2019, [cvf_days("ICCV", ["2019-10-29", "2019-10-30", "2019-10-31", "2019-11-01"])]),
+        Edition(None, None, [Track("ICCV {year}", "https://openaccess.thecvf.com/ICCV{year}", "html", {"extractor": "cvf", "skip": 0})]),
+    ],
+    "icml": [
+        Edition(2023, 2024, [icml_session("Poster"), icml_session("Oral")]),
+        Edition(2017, 2022, [Track("ICML {year}", "https://proceedings.mlr.press", "pmlr", {"volume": "Proceedings of ICML {year}"})]),
+        Edition(None, 2016, [Track("ICML {year}", "https://proceedings.mlr.press", "pmlr", {"volume": "ICML {year} Proceedings"})]),
+    ],
+    "acl": [
+        Edition(2021, None, [anthology("acl", ["{year}acl-long", "{year}acl-short"])]),
+        Edition(2020, 2020, [anthology("acl", ["{year}acl-main"])]),
+        Edition(2019, 2019, [anthology("acl", ["p{yy}-1"])]),
+        Edition(2018, 2018, [anthology("acl", ["p{yy}-1", "p{yy}-2"])]),
+    ],
+    "emnlp": [
+        Edition(2022, 2022, [anthology("emnlp", None, "https://preview.aclanthology.org/emnlp-22-ingestion/volumes/2022.emnlp-main/")]),
+        Edition(2020, None, [anthology("emnlp", ["{year}emnlp-main"])]),
+        Edition(2018, 2019, [anthology("emnlp", ["d{yy}-1"])]),
+    ],
+}
+
+def get_openreview_notes(url    : str,
+                         limit  : int,
+                         fields : Dict[str, str],
+                         workers: int = 8
+                        ) -> Iterator[Dict]:
+    # The first page tells us the total count, after which every remaining
+    # page is known up front and can be fetched concurrently. Notes are
+    # streamed and reduced to `fields`, dropping the unused details.
+    page = {}
+    yield from fetch.iter_json(f"{url}&offset=0&limit={limit}", "notes", fields, page)
+    urls = [f"{url}&offset={offset}&limit={limit}" for offset in range(limit, page["count"], limit)]
+    for res in fetch.get_many(urls, workers):
+        yield from fetch.decode_records(res, "notes", fields)
+
+# Schemes read one track's papers. They may replace context["source"] once the
+# real listing URL is known.
+
+def read_html(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    # Several pages (e.g. one per conference day) are fetched concurrently.
+    options = dict(options)
+    extractor = getattr(extract, options.pop("extractor"))
+    pages = options.pop("pages", None)
+    responses = fetch.get_many(pages) if pages else [fetch.get(context["source"])]
+    for res in responses:
+        yield from parsing.extract(extractor, res, **options)
+
+def read_openreview(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    for note in get_openreview_notes(context["source"], options["limit"], options["fields"]):
+        yield note["title"], note["authors"]
+
+def read_json(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    # Tracks that share one JSON file (e.g. ICML orals and posters) select
+    # their records from a single decode.
+    url = context["source"]
+    records = fetch.memoize(("json", url), lambda: list(fetch.iter_json(url, options["key"], options["fields"])))
+    for record in records:
+        if all(record[key] == value for key, value in options["select"].items()):
+            yield record["title"], record["authors"]
+
+def read_csv(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    with open(context["source"], "rt") as f:
+        for row in csv.reader(f):
+            yield row[0], [author.replace(options["strip"], "") for author in row[1].split(options["separator"])]
+
+def read_index(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    # One page lists every year (ecva.net); it is parsed once per run into
+    # (year, title, authors) rows.
+    url = context["source"]
+    extractor = getattr(extract, options["extractor"])
+    rows = fetch.memoize((options["extractor"], url), lambda: parsing.extract(extractor, fetch.get(url)))
+    return ((title.strip(), authors) for paper_year, title, authors in rows if paper_year == year)
+
+def read_pmlr(context: Dict, options: Dict, year: int) -> Iterator[Paper]:
+    # proceedings.mlr.press lists every volume; the track's volume is the
+    # first non-workshop entry whose title contains options["volume"].
+    index = context["source"]
+    proceedings = fetch.memoize(("pmlr_proceedings", index), lambda: parsing.extract(extract.pmlr_proceedings, fetch.get(index)))
+    href = next(link for text, link in proceedings if options["volume"] in text and "Workshop" not in text)
+    context["source"] = f"{index}/{href}"
+    return parsing.extract(extract.pmlr, fetch.get(context["source"]))
+
+schemes: Dict[str, Callable[[Dict, Dict, int], Iterable[Paper]]] = {
+    "html"       : read_html,
+    "openreview" : read_openreview,
+    "json"       : read_json,
+    "csv"        : read_csv,
+    "index"      : read_index,
+    "pmlr"       : read_pmlr,
+}
+
+def collect(results : Results,
+            track   : int,
+            papers  : Iterable[Paper],
+            matcher : KeywordMatcher
+            ) -> None:
+    from tqdm import tqdm
+    start = time.perf_counter()
+    scanned = 0
+    matched_papers = 0
+    for title, authors in tqdm(papers):
+        scanned += 1
+        matched = matcher.match(title)
+        if matched:
+            matched_papers += 1
+            results.append(track, title, authors, matched)
+    stats.record_track(results.tracks[track], time.perf_counter() - start, scanned, matched_papers)
+
+def edition(venue: str, year: int) -> Optional[Edition]:
+    for candidate in venues[venue]:
+        if candidate.covers(year):
+            return candidate
+    return None
+
+def get_papers(venue    : str,
+               year     : int,
+               matcher  : KeywordMatcher
+               ) -> Optional[Results]:
+    # None for years the registry does not know, so that the rest of a
+    # multi-venue run still completes.
+    found = edition(venue, year)
+    if found is None:
+        print(f"{venue} {year} is not in the venue registry, skipped")
+        return None
+    results = Results()
+    for track in found.tracks:
+        context = {"source": fill(track.source, year)}
+        code = results.add_track(fill(track.label, year))
+        collect(results, code, schemes[track.scheme](context, fill(track.options, year), year), matcher)
+        # Schemes may point the source at the page they actually read.
+        results.sources[code] = context["source"]
+    return results
+
+def getter(venue: str) -> Callable[[int, KeywordMatcher], Optional[Results]]:
+    return lambda year, matcher: get_papers(venue, year, matcher)